@@ -0,0 +1,32 @@
+"""add transactions user_id timestamp index
+
+Revision ID: a3c91b27d54e
+Revises: f265e39510ae
+Create Date: 2026-08-29 10:14:02.118347
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91b27d54e'
+down_revision: Union[str, Sequence[str], None] = 'f265e39510ae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_transactions_user_id_timestamp',
+        'transactions',
+        ['user_id', 'timestamp'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_user_id_timestamp', table_name='transactions')
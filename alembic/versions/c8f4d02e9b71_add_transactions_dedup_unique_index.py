@@ -0,0 +1,48 @@
+"""add transactions dedup unique index
+
+Revision ID: c8f4d02e9b71
+Revises: a3c91b27d54e
+Create Date: 2026-08-29 15:41:27.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f4d02e9b71'
+down_revision: Union[str, Sequence[str], None] = 'a3c91b27d54e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Deployed databases may already hold duplicates from re-uploaded
+    # statements (the very thing this index guards against), so keep the
+    # lowest-id row per dedup group and drop the rest before the unique
+    # index is created, or the CREATE INDEX itself would fail
+    op.execute(
+        """
+        DELETE FROM transactions a
+        USING transactions b
+        WHERE a.id > b.id
+          AND a.user_id = b.user_id
+          AND a.timestamp = b.timestamp
+          AND a.amount = b.amount
+          AND a.description = b.description
+        """
+    )
+    op.create_index(
+        'uq_transactions_dedup',
+        'transactions',
+        ['user_id', 'timestamp', 'amount', 'description'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_transactions_dedup', table_name='transactions')
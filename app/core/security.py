@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app.db.db import get_db
 from app.models.user import User
 
@@ -49,3 +49,44 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
         raise credentials_exception
 
     return user
+
+
+def get_current_user_with_relations(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+    """
+    Like get_current_user, but eager-loads the user's collections.
+
+    Handlers that walk user.transactions/budgets/insights (dashboard-style
+    views) should depend on this instead of get_current_user: selectinload
+    fetches each collection in one extra query instead of one lazy query
+    per relationship access (and avoids joinedload's row duplication for
+    one-to-many). Handlers that only need the user row should keep using
+    get_current_user so every request doesn't pay for collections it never
+    touches.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id: str = payload.get("sub")
+        if user_id is None:
+            raise credentials_exception
+    except JWTError:
+        raise credentials_exception
+
+    user = (
+        db.query(User)
+        .options(
+            selectinload(User.transactions),
+            selectinload(User.budgets),
+            selectinload(User.insights),
+        )
+        .filter(User.id == user_id)
+        .first()
+    )
+    if user is None:
+        raise credentials_exception
+
+    return user
@@ -1,12 +1,24 @@
+import uuid
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
 from app.models.transaction import TransactionModel
 from app.schemas.transaction import TransactionCreate
 
 
-def get_transactions(db: Session, user_id: UUID) -> list[TransactionModel]:
-    return db.query(TransactionModel).filter(TransactionModel.user_id == user_id).all()
+def get_transactions(
+    db: Session, user_id: UUID, limit: int | None = None
+) -> list[TransactionModel]:
+    # Newest first; the (user_id, timestamp) index services filter and sort
+    query = (
+        db.query(TransactionModel)
+        .filter(TransactionModel.user_id == user_id)
+        .order_by(TransactionModel.timestamp.desc())
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
 
 
 def get_transaction_by_id(db: Session, transaction_id: UUID) -> TransactionModel | None:
@@ -16,17 +28,56 @@ def get_transaction_by_id(db: Session, transaction_id: UUID) -> TransactionModel
 def create_transaction_for_user(
     db: Session, transaction_in: TransactionCreate, user_id: UUID
 ) -> TransactionModel:
-    transaction_data = transaction_in.model_dump()
     new_transaction = TransactionModel(
-        amount=transaction_data["amount"],
-        description=transaction_data["description"],
-        category=transaction_data["category"],
-        transaction_type=transaction_data["transaction_type"],
-        source=transaction_data["source"],
-        timestamp=transaction_data.get("timestamp") or datetime.utcnow(),
+        amount=transaction_in.amount,
+        description=transaction_in.description,
+        category=transaction_in.category,
+        transaction_type=transaction_in.transaction_type,
+        source=transaction_in.source,
+        timestamp=transaction_in.timestamp or datetime.now(timezone.utc),
         user_id=user_id
     )
     db.add(new_transaction)
     db.commit()
     db.refresh(new_transaction)
     return new_transaction
+
+
+def create_transactions_for_user_bulk(
+    db: Session, transactions_in: list[TransactionCreate], user_id: UUID
+) -> int:
+    """
+    Insert many transactions in a single statement and a single commit.
+
+    The PDF pipeline produces hundreds of transactions per document; looping
+    create_transaction_for_user would cost one round-trip and commit per row.
+    Re-uploaded rows hit the uq_transactions_dedup index and are dropped via
+    ON CONFLICT DO NOTHING, mirroring services.transaction.insert_transactions;
+    the returned count covers only the rows that actually inserted.
+    """
+    if not transactions_in:
+        return 0
+
+    rows = []
+    for transaction_in in transactions_in:
+        rows.append({
+            "id": uuid.uuid4(),
+            "amount": transaction_in.amount,
+            "description": transaction_in.description,
+            "category": transaction_in.category,
+            "transaction_type": transaction_in.transaction_type,
+            "source": transaction_in.source,
+            "timestamp": transaction_in.timestamp or datetime.now(timezone.utc),
+            "user_id": user_id,
+        })
+
+    statement = (
+        insert(TransactionModel)
+        .on_conflict_do_nothing(
+            index_elements=["user_id", "timestamp", "amount", "description"]
+        )
+        .returning(TransactionModel.id)
+    )
+    inserted_ids = db.execute(statement, rows).scalars().all()
+    db.commit()
+    return len(inserted_ids)
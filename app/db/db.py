@@ -9,8 +9,22 @@ from contextlib import contextmanager
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+# Pool tuning: keep warm connections around so ingestion bursts don't pay
+# connection-establishment latency per request. pool_pre_ping drops stale
+# connections; pool_recycle stays under typical server-side idle timeouts.
+# SQLite (used in tests) has no QueuePool sizing knobs, so only pass them
+# for real database URLs.
+# pool_timeout keeps checkout waits short so saturation surfaces as a fast
+# error instead of requests queueing for the default 30 seconds.
+_engine_kwargs = {"pool_pre_ping": True}
+if DATABASE_URL and not DATABASE_URL.startswith("sqlite"):
+    _engine_kwargs.update(pool_size=20, max_overflow=40, pool_recycle=1800, pool_timeout=10)
+
+# expire_on_commit=False keeps attribute values usable after commit instead
+# of expiring them, which would silently re-SELECT every row touched after a
+# commit (e.g. when building the response from a just-inserted transaction).
+engine = create_engine(DATABASE_URL, **_engine_kwargs)
+SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, expire_on_commit=False)
 
 def get_db():
     db = SessionLocal()
@@ -2,11 +2,76 @@
 Stage 2: Convert cleaned transaction text into structured transaction objects
 """
 
-import json
+import asyncio
+import os
 import re
-from typing import List, Dict
+import tempfile
+from datetime import datetime
+from typing import List, Dict, Optional
+
+import orjson
+from functools import lru_cache
+
 from app.llm.llm_config import get_extraction_llm
 from app.llm.prompts.deliver_transactions import deliver_transactions_prompt
+from app.services.rate_limit import get_limiter
+
+# Concurrency cap for the sync batch path; the async path is capped by the
+# provider limiter's semaphore instead
+MAX_CONCURRENT_CHUNKS = 8
+
+# Compiled once; _parse_transaction_json runs once per chunk
+_JSON_FENCE_RE = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)  # ```json ... ```
+_FENCE_RE = re.compile(r'```\s*(.*?)\s*```', re.DOTALL)           # ``` ... ```
+_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)                      # [ ... ] (bare array)
+
+@lru_cache(maxsize=4)
+def _get_transactions_chain(provider: str = None):
+    """Build (and cache) the Stage 2 prompt | LLM chain per provider"""
+    return deliver_transactions_prompt | get_extraction_llm(provider=provider)
+
+
+# Matches one whole Stage 1 block, markers included
+_TRANSACTION_BLOCK_RE = re.compile(r'TRANSACTION_START.*?TRANSACTION_END', re.DOTALL)
+
+# Stage 1 emits a rigid block format, so most documents can be parsed without an LLM call
+_BLOCK_RE = re.compile(
+    r'DATE:\s*(\S+)\s+'
+    r'AMOUNT:\s*(\S+)\s+'
+    r'SOURCE:\s*(\S+)\s+'
+    r'TRANSACTION_TYPE:\s*(\S+)\s+'
+    r'DESCRIPTION:\s*(.+?)\s+'
+    r'TRANSACTION_END',
+    re.DOTALL,
+)
+
+_SOURCE_MAP = {
+    "CREDIT_CARD": "credit",
+    "DEBIT_CHECKING": "debit",
+    "SAVINGS": "savings",
+}
+
+_DATE_FORMATS = ("%m/%d/%y", "%m/%d/%Y", "%Y-%m-%d")
+
+# Broad categories keyed on merchant keywords; "Other" when nothing matches
+_CATEGORY_KEYWORDS = [
+    ("Food", ("starbucks", "doordash", "grubhub", "restaurant", "cafe", "coffee",
+              "grocery", "safeway", "trader joe", "whole foods", "mcdonald", "chipotle")),
+    ("Transportation", ("uber", "lyft", "shell", "chevron", "parking", "transit", "toll", "gas")),
+    ("Entertainment", ("netflix", "spotify", "hulu", "disney", "cinema", "steam", "playstation")),
+    ("Shopping", ("amazon", "target", "walmart", "costco", "ebay")),
+    ("Education", ("coursera", "udemy", "tuition", "university")),
+    ("Utilities", ("comcast", "verizon", "at&t", "electric", "water", "internet")),
+    ("Income", ("payroll", "salary", "direct deposit", "payment thank you")),
+]
+
+# Require nearly all blocks to parse before trusting the deterministic path
+MIN_DETERMINISTIC_PARSE_RATIO = 0.9
+
+# Validation sets, hoisted so per-transaction checks are set lookups
+_REQUIRED_FIELDS = frozenset(("amount", "description", "transaction_type", "source", "timestamp", "category"))
+_TRANSACTION_TYPES = frozenset(("income", "expense"))
+_TRANSACTION_SOURCES = frozenset(("credit", "debit", "savings"))
 
 def split_transaction_blocks(text: str, max_transactions_per_chunk: int = 25) -> list:
     """
@@ -19,36 +84,92 @@ def split_transaction_blocks(text: str, max_transactions_per_chunk: int = 25) ->
     Returns:
         List of text chunks containing transaction blocks
     """
-    # Split by TRANSACTION_START to get individual transactions
-    transactions = text.split('TRANSACTION_START')
-    
-    # Remove empty first element and re-add TRANSACTION_START to each
-    transaction_blocks = []
-    for i, tx in enumerate(transactions):
-        if i == 0 and not tx.strip():
-            continue
-        
-        # Re-add TRANSACTION_START prefix
-        if i > 0:
-            tx = 'TRANSACTION_START' + tx
-        transaction_blocks.append(tx.strip())
-    
-    # Group transactions into chunks
+    # Single pass: yield whole blocks (markers included) and group as we go
     chunks = []
     current_chunk = []
-    
-    for tx_block in transaction_blocks:
-        current_chunk.append(tx_block)
-        
+
+    for match in _TRANSACTION_BLOCK_RE.finditer(text):
+        current_chunk.append(match.group(0))
+
         if len(current_chunk) >= max_transactions_per_chunk:
             chunks.append('\n\n'.join(current_chunk))
             current_chunk = []
-    
+
     # Add remaining transactions
     if current_chunk:
         chunks.append('\n\n'.join(current_chunk))
-    
-    return [chunk for chunk in chunks if chunk.strip()]
+
+    # No recognizable blocks: hand the raw text through as one chunk so the
+    # LLM fallback still sees it
+    if not chunks and text.strip():
+        chunks.append(text.strip())
+
+    return chunks
+
+def _parse_block_date(date_str: str) -> Optional[str]:
+    """Convert a Stage 1 DATE value to an ISO timestamp string, or None if unparseable"""
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).isoformat()
+        except ValueError:
+            continue
+    return None
+
+def _infer_category(description: str) -> str:
+    """Infer a broad category from the transaction description via keyword lookup"""
+    lowered = description.lower()
+    for category, keywords in _CATEGORY_KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            return category
+    return "Other"
+
+def _parse_blocks_deterministic(text: str) -> List[Dict]:
+    """
+    Parse Stage 1 transaction blocks with a regex instead of an LLM call
+
+    Stage 1 emits fixed field names (DATE, AMOUNT, SOURCE, TRANSACTION_TYPE,
+    DESCRIPTION), so the blocks are fully regular and do not need a model to
+    reformat them into JSON. Blocks with unrecognized values are skipped.
+
+    Args:
+        text: Transaction blocks text from Stage 1
+
+    Returns:
+        List of transaction dictionaries matching the Stage 2 output schema
+    """
+    transactions = []
+    for match in _BLOCK_RE.finditer(text):
+        date_str, amount_str, source_raw, type_raw, description = match.groups()
+
+        source = _SOURCE_MAP.get(source_raw.upper())
+        transaction_type = type_raw.lower()
+        if source is None or transaction_type not in ("income", "expense"):
+            continue
+
+        try:
+            amount = float(amount_str.replace("$", "").replace(",", ""))
+        except ValueError:
+            continue
+
+        timestamp = _parse_block_date(date_str)
+        if timestamp is None:
+            continue
+
+        description = " ".join(description.split())
+        transactions.append({
+            "amount": amount,
+            "description": description,
+            "category": _infer_category(description),
+            "transaction_type": transaction_type,
+            "source": source,
+            "timestamp": timestamp,
+        })
+
+    return transactions
+
+def parse_transaction_blocks(text: str) -> List[Dict]:
+    """Deterministically parse and validate Stage 1 blocks (no LLM call)"""
+    return _validate_transactions(_parse_blocks_deterministic(text))
 
 def run_chain_lines_to_transactions(cleaned_text: str, model_provider: str = None) -> List[Dict]:
     """
@@ -62,41 +183,93 @@ def run_chain_lines_to_transactions(cleaned_text: str, model_provider: str = Non
         List of transaction dictionaries
     """
     try:
-        # Get LLM instance optimized for extraction
-        llm = get_extraction_llm(provider=model_provider)
-        
-        # Create chain: Prompt → LLM  
-        chain = deliver_transactions_prompt | llm
-        
+        # Fast path: Stage 1 blocks are regular, so try parsing without an LLM call
+        deterministic = _try_deterministic(cleaned_text)
+        if deterministic is not None:
+            return deterministic
+
+        chain = _get_transactions_chain(model_provider)
+
         # Split into chunks to handle large inputs
         chunks = split_transaction_blocks(cleaned_text, max_transactions_per_chunk=25)
         print(f"Stage 2: Processing {len(chunks)} chunks")
-        
-        # Process each chunk
-        all_transactions = []
-        for i, chunk in enumerate(chunks):
-            try:
-                print(f"Stage 2: Processing chunk {i+1}/{len(chunks)}")
-                result = chain.invoke({"cleaned_text": chunk})
-                
-                # Parse and validate JSON response for this chunk
-                chunk_transactions = _parse_transaction_json(result.content)
-                validated_transactions = _validate_transactions(chunk_transactions)
-                
-                all_transactions.extend(validated_transactions)
-                print(f"Stage 2: Chunk {i+1} converted {len(validated_transactions)} transactions")
-                
-            except Exception as chunk_error:
-                print(f"Stage 2: Chunk {i+1} failed: {str(chunk_error)}")
-                continue
-        
-        print(f"Stage 2: Successfully processed {len(chunks)} chunks, total {len(all_transactions)} transactions")
-        return all_transactions
-        
+
+        # Batch chunk calls; the runnable fans them out concurrently under the hood
+        results = chain.batch(
+            [{"cleaned_text": chunk} for chunk in chunks],
+            config={"max_concurrency": MAX_CONCURRENT_CHUNKS},
+            return_exceptions=True,
+        )
+
+        return _collect_chunk_transactions(chunks, results)
+
+    except Exception as e:
+        print(f"Stage 2 extraction failed: {str(e)}")
+        return []
+
+async def arun_chain_lines_to_transactions(cleaned_text: str, model_provider: str = None) -> List[Dict]:
+    """Async variant of run_chain_lines_to_transactions (per-call rate limiting)"""
+    try:
+        deterministic = _try_deterministic(cleaned_text)
+        if deterministic is not None:
+            return deterministic
+
+        chain = _get_transactions_chain(model_provider)
+        limiter = get_limiter(model_provider)
+
+        chunks = split_transaction_blocks(cleaned_text, max_transactions_per_chunk=25)
+        print(f"Stage 2: Processing {len(chunks)} chunks")
+
+        # One limiter.run per chunk so the RPM window counts every provider
+        # call and the limiter's semaphore caps the fan-out
+        results = await asyncio.gather(
+            *[
+                limiter.run(
+                    chain.ainvoke,
+                    {"cleaned_text": chunk},
+                    estimated_tokens=len(chunk) // 4,
+                )
+                for chunk in chunks
+            ],
+            return_exceptions=True,
+        )
+
+        return _collect_chunk_transactions(chunks, results)
+
     except Exception as e:
         print(f"Stage 2 extraction failed: {str(e)}")
         return []
 
+def _try_deterministic(cleaned_text: str) -> Optional[List[Dict]]:
+    """Return deterministically parsed transactions, or None if the LLM is needed"""
+    block_count = cleaned_text.count('TRANSACTION_START')
+    parsed = _parse_blocks_deterministic(cleaned_text)
+    if block_count and len(parsed) >= block_count * MIN_DETERMINISTIC_PARSE_RATIO:
+        print(f"Stage 2: Parsed {len(parsed)}/{block_count} blocks deterministically, skipping LLM")
+        return _validate_transactions(parsed)
+
+    if block_count:
+        print(f"Stage 2: Only {len(parsed)}/{block_count} blocks parsed deterministically, falling back to LLM")
+    return None
+
+def _collect_chunk_transactions(chunks: list, results: list) -> List[Dict]:
+    """Parse and validate per-chunk LLM responses in input order"""
+    all_transactions = []
+    for i, result in enumerate(results):
+        if isinstance(result, Exception):
+            print(f"Stage 2: Chunk {i+1} failed: {str(result)}")
+            continue
+
+        # Parse and validate JSON response for this chunk
+        chunk_transactions = _parse_transaction_json(result.content)
+        validated_transactions = _validate_transactions(chunk_transactions)
+
+        all_transactions.extend(validated_transactions)
+        print(f"Stage 2: Chunk {i+1} converted {len(validated_transactions)} transactions")
+
+    print(f"Stage 2: Successfully processed {len(chunks)} chunks, total {len(all_transactions)} transactions")
+    return all_transactions
+
 def _parse_transaction_json(llm_response: str) -> List[Dict]:
     """
     Parse JSON from LLM response, handling various response formats
@@ -109,45 +282,49 @@ def _parse_transaction_json(llm_response: str) -> List[Dict]:
     """
     try:
         # Try direct JSON parsing first
-        transactions = json.loads(llm_response)
+        transactions = orjson.loads(llm_response)
         if isinstance(transactions, list):
             return transactions
         else:
             print(f"Expected list, got {type(transactions)}")
             return []
-            
-    except json.JSONDecodeError:
+
+    except orjson.JSONDecodeError:
         # Try to extract JSON from markdown code blocks
-        json_patterns = [
-            r'```json\s*(.*?)\s*```',  # ```json ... ```
-            r'```\s*(.*?)\s*```',      # ``` ... ```
-            r'\[(.*?)\]'               # [ ... ] (simple array)
-        ]
-        
-        for pattern in json_patterns:
-            match = re.search(pattern, llm_response, re.DOTALL)
+        for pattern in (_JSON_FENCE_RE, _FENCE_RE):
+            match = pattern.search(llm_response)
             if match:
                 try:
-                    json_text = match.group(1)
-                    if pattern == r'\[(.*?)\]':
-                        json_text = f"[{json_text}]"
-                    
-                    transactions = json.loads(json_text)
+                    transactions = orjson.loads(match.group(1))
                     if isinstance(transactions, list):
                         return transactions
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     continue
+
+        # Last resort: a bare array somewhere in the response
+        match = _ARRAY_RE.search(llm_response)
+        if match:
+            try:
+                transactions = orjson.loads(match.group(0))
+                if isinstance(transactions, list):
+                    return transactions
+            except orjson.JSONDecodeError:
+                pass
         
         # Log failure for debugging
         print(f"Failed to parse JSON from LLM response:")
         print(f"Response preview: {llm_response[:500]}...")
         print(f"Full response length: {len(llm_response)} characters")
-        
-        # Try to save the full response for debugging
-        with open("debug_stage2_response.txt", "w") as f:
-            f.write(llm_response)
-        print("Full response saved to debug_stage2_response.txt")
-        
+
+        # Full dump only when explicitly enabled: concurrent chunk failures
+        # would otherwise serialize on (and overwrite) a shared file
+        if os.getenv("LLM_DEBUG"):
+            with tempfile.NamedTemporaryFile(
+                "w", prefix="stage2_", suffix=".txt", delete=False
+            ) as f:
+                f.write(llm_response)
+            print(f"Full response saved to {f.name}")
+
         return []
 
 def _validate_transactions(transactions: List[Dict]) -> List[Dict]:
@@ -161,34 +338,27 @@ def _validate_transactions(transactions: List[Dict]) -> List[Dict]:
         Validated transaction list
     """
     validated = []
-    required_fields = ["amount", "description", "transaction_type", "source", "timestamp", "category"]
-    
+
     for tx in transactions:
         try:
             # Check required fields
-            if not all(field in tx for field in required_fields):
+            if not _REQUIRED_FIELDS <= tx.keys():
                 print(f"Skipping transaction missing required fields: {tx}")
                 continue
-            
-            # Validate amount
-            if not isinstance(tx["amount"], (int, float)):
-                print(f"Skipping transaction with invalid amount: {tx}")
-                continue
-            
-            # Validate transaction_type
-            if tx["transaction_type"] not in ["income", "expense"]:
-                print(f"Skipping transaction with invalid type: {tx}")
-                continue
-                
-            # Validate source
-            if tx["source"] not in ["credit", "debit", "savings"]:
-                print(f"Skipping transaction with invalid source: {tx}")
+
+            # Validate amount, transaction_type and source in one pass
+            if (
+                not isinstance(tx["amount"], (int, float))
+                or tx["transaction_type"] not in _TRANSACTION_TYPES
+                or tx["source"] not in _TRANSACTION_SOURCES
+            ):
+                print(f"Skipping invalid transaction: {tx}")
                 continue
-            
+
             validated.append(tx)
-            
+
         except Exception as e:
             print(f"Error validating transaction {tx}: {e}")
             continue
-    
+
     return validated
@@ -0,0 +1,97 @@
+"""
+Combined Stage 0+1: clean raw PDF text and emit transaction blocks in one LLM pass
+"""
+
+import asyncio
+from functools import lru_cache
+
+from app.llm.llm_config import get_preprocessing_llm
+from app.llm.prompts.clean_and_format import clean_and_format_prompt
+from app.llm.chains.format_transactions import (
+    MAX_CHUNK_TOKENS,
+    MAX_CONCURRENT_CHUNKS,
+    split_text_intelligently,
+)
+from app.services.rate_limit import get_limiter
+
+
+@lru_cache(maxsize=4)
+def _get_clean_and_format_chain(provider: str = None):
+    """Build (and cache) the combined prompt | LLM chain per provider"""
+    return clean_and_format_prompt | get_preprocessing_llm(provider=provider)
+
+
+def run_chain_clean_and_format(raw_text: str, model_provider: str = None) -> str:
+    """
+    Clean raw statement text and format transaction blocks in a single LLM pass
+
+    Both stages run on the same fast tier, so fusing them halves the LLM
+    round-trips versus calling Stage 0 and Stage 1 sequentially.
+
+    Args:
+        raw_text: Raw text from PDF extraction
+        model_provider: "openai" or "anthropic" (defaults to env LLM_PROVIDER)
+
+    Returns:
+        Structured text with transaction blocks
+    """
+    try:
+        chain = _get_clean_and_format_chain(model_provider)
+
+        chunks = split_text_intelligently(raw_text, max_chunk_tokens=MAX_CHUNK_TOKENS)
+        print(f"Stage 0+1: Processing {len(chunks)} chunks")
+
+        results = chain.batch(
+            [{"text": chunk} for chunk in chunks],
+            config={"max_concurrency": MAX_CONCURRENT_CHUNKS},
+            return_exceptions=True,
+        )
+
+        return _merge_results(chunks, results)
+
+    except Exception as e:
+        print(f"Stage 0+1 processing failed: {str(e)}")
+        return raw_text  # Fallback to original text
+
+async def arun_chain_clean_and_format(raw_text: str, model_provider: str = None) -> str:
+    """Async variant of run_chain_clean_and_format (per-call rate limiting)"""
+    try:
+        chain = _get_clean_and_format_chain(model_provider)
+        limiter = get_limiter(model_provider)
+
+        chunks = split_text_intelligently(raw_text, max_chunk_tokens=MAX_CHUNK_TOKENS)
+        print(f"Stage 0+1: Processing {len(chunks)} chunks")
+
+        # One limiter.run per chunk so the RPM window counts every provider
+        # call and the limiter's semaphore caps the fan-out
+        results = await asyncio.gather(
+            *[
+                limiter.run(
+                    chain.ainvoke,
+                    {"text": chunk},
+                    estimated_tokens=len(chunk) // 4,
+                )
+                for chunk in chunks
+            ],
+            return_exceptions=True,
+        )
+
+        return _merge_results(chunks, results)
+
+    except Exception as e:
+        print(f"Stage 0+1 processing failed: {str(e)}")
+        return raw_text  # Fallback to original text
+
+def _merge_results(chunks: list, results: list) -> str:
+    """Merge batch results in input order, dropping failed chunks"""
+    processed_chunks = []
+    for i, result in enumerate(results):
+        if isinstance(result, Exception):
+            print(f"Stage 0+1: Chunk {i+1} failed: {str(result)}")
+            continue
+        processed_chunks.append(result.content)
+
+    merged_result = "\n\n".join(processed_chunks)
+
+    print(f"Stage 0+1: Successfully processed {len(chunks)} chunks")
+    return merged_result
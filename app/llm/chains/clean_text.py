@@ -2,37 +2,142 @@
 Stage 0: Clean and filter raw PDF text
 """
 
+import re
+from functools import lru_cache
+
 from app.llm.llm_config import get_preprocessing_llm
 from app.llm.prompts.preprocess_input import preprocess_input_prompt
 
+# Boilerplate that never carries transaction data
+_URL_RE = re.compile(r'https?://\S+|www\.\S+', re.IGNORECASE)
+_PHONE_RE = re.compile(r'\b(?:1[-.])?\d{3}[-.]\d{3}[-.]\d{4}\b')
+_PAGE_LINE_RE = re.compile(r'^\s*page\s+\d+(\s+of\s+\d+)?\s*$', re.IGNORECASE)
+
+# Lines containing these fragments are legal/policy/service text
+_LEGAL_FRAGMENTS = (
+    "terms of service",
+    "disclaimer",
+    "billing rights",
+    "error resolution",
+    "write to us",
+    "business days",
+    "annual percentage rate",
+    "how to avoid paying interest",
+    "making your payments",
+    "customer service",
+    "member fdic",
+    "point-of-sale",
+    "foreign-initiated",
+    "this page intentionally left blank",
+)
+
+# A transaction-looking line has a date and a dollar amount
+_DATE_TOKEN_RE = re.compile(r'\b\d{1,2}/\d{1,2}(?:/\d{2,4})?\b')
+_AMOUNT_TOKEN_RE = re.compile(r'-?\$?\d{1,3}(?:,\d{3})*\.\d{2}\b')
+
+# Account type indicators, checked in order (credit before debit: "debit card"
+# never appears on credit statements but "card" does on both)
+_ACCOUNT_TYPE_INDICATORS = (
+    ("CREDIT_CARD", ("credit card", "card services", "chase freedom", "minimum payment due")),
+    ("DEBIT_CHECKING", ("checking", "debit")),
+    ("SAVINGS", ("savings",)),
+)
+
+# Skip the Stage 0 LLM call when the deterministic pass is confident enough
+CLEAN_CONFIDENCE_THRESHOLD = 0.6
+
+
+@lru_cache(maxsize=4)
+def _get_clean_chain(provider: str = None):
+    """Build (and cache) the Stage 0 prompt | LLM chain per provider"""
+    return preprocess_input_prompt | get_preprocessing_llm(provider=provider)
+
+
+def _detect_account_type(raw_text: str) -> str:
+    """Detect the statement's account type from keywords, or None"""
+    lowered = raw_text.lower()
+    for account_type, indicators in _ACCOUNT_TYPE_INDICATORS:
+        if any(indicator in lowered for indicator in indicators):
+            return account_type
+    return None
+
+def deterministic_clean(raw_text: str) -> tuple:
+    """
+    Strip boilerplate with compiled patterns instead of an LLM call
+
+    Drops URL/phone/legal/footer lines, detects the account type, and scores
+    how transaction-like the remainder looks.
+
+    Args:
+        raw_text: Raw text from PDF extraction
+
+    Returns:
+        (cleaned text with ACCOUNT_TYPE header, confidence in [0, 1])
+    """
+    account_type = _detect_account_type(raw_text)
+
+    kept_lines = []
+    transaction_like = 0
+    for line in raw_text.split('\n'):
+        stripped = line.strip()
+        if not stripped:
+            continue
+
+        # Transaction-looking lines are always kept: merchant descriptors often
+        # embed phone numbers and URLs
+        is_transaction = bool(_DATE_TOKEN_RE.search(stripped) and _AMOUNT_TOKEN_RE.search(stripped))
+        if not is_transaction:
+            if _URL_RE.search(stripped) or _PHONE_RE.search(stripped) or _PAGE_LINE_RE.match(stripped):
+                continue
+            lowered = stripped.lower()
+            if any(fragment in lowered for fragment in _LEGAL_FRAGMENTS):
+                continue
+
+        kept_lines.append(stripped)
+        if is_transaction:
+            transaction_like += 1
+
+    if not kept_lines or account_type is None:
+        return raw_text, 0.0
+
+    cleaned = f"ACCOUNT_TYPE = {account_type}\n" + "\n".join(kept_lines)
+    confidence = transaction_like / len(kept_lines)
+    return cleaned, confidence
 
 def run_chain_clean_text(raw_text: str, model_provider: str = None) -> str:
     """
     Stage 0: Clean raw PDF text by removing legal disclaimers, headers, and metadata
-    
+
+    A deterministic pre-filter handles the common case (well-structured
+    statements) without any LLM call; the LLM only sees the pre-filtered
+    residual when the heuristics aren't confident.
+
     Args:
         raw_text: Raw text from PDF extraction
         model_provider: "openai" or "anthropic" (defaults to env LLM_PROVIDER)
-        
+
     Returns:
         Clean text with legal content removed but transaction data preserved
     """
     try:
-        llm = get_preprocessing_llm(provider=model_provider)
-        
-        # Create chain: Prompt → LLM
-        chain = preprocess_input_prompt | llm
-        
+        cleaned_text, confidence = deterministic_clean(raw_text)
+        if confidence >= CLEAN_CONFIDENCE_THRESHOLD:
+            print(f"Stage 0: Deterministic clean (confidence {confidence:.2f}), skipping LLM")
+            return cleaned_text
+
+        chain = _get_clean_chain(model_provider)
+
         print(f"Stage 0: Cleaning raw text ({len(raw_text)} characters)")
-        
-        # Run text cleaning
-        result = chain.invoke({"text": raw_text})
-        
+
+        # Run text cleaning on the pre-filtered text (smaller payload than raw)
+        llm_input = cleaned_text if confidence > 0 else raw_text
+        result = chain.invoke({"text": llm_input})
+
         cleaned_text = result.content
         print(f"Stage 0: Cleaned text output ({len(cleaned_text)} characters)")
-        
+
         return cleaned_text
-        
+
     except Exception as e:
         print(f"Stage 0 text cleaning failed: {str(e)}")
         return raw_text  # Fallback to original text
@@ -2,126 +2,310 @@
 Stage 1: Extract and clean transaction lines from raw PDF text
 """
 
+import asyncio
+from functools import lru_cache
+
+import tiktoken
+
 from app.llm.llm_config import get_preprocessing_llm
 from app.llm.prompts.build_transaction_blocks import build_transaction_blocks_prompt
+from app.services.rate_limit import get_limiter
+
+# Concurrency cap for the sync batch path; the async paths are capped by the
+# provider limiter's semaphore instead, so both agree on in-flight calls
+MAX_CONCURRENT_CHUNKS = 8
+
+# Stage 1 expands text ~3x, so keep input chunks small enough that the
+# expanded output fits the 4096-token completion limit
+MAX_CHUNK_TOKENS = 1200
+
+
+@lru_cache(maxsize=1)
+def _get_encoder():
+    """Tokenizer for chunk budgeting; None if the BPE files are unavailable"""
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+def _count_tokens(text: str) -> int:
+    """Count tokens with the real tokenizer, or ~4 chars/token as fallback"""
+    encoder = _get_encoder()
+    if encoder is None:
+        return max(1, len(text) // 4)
+    return len(encoder.encode(text))
+
+
+@lru_cache(maxsize=4)
+def _get_blocks_chain(provider: str = None):
+    """Build (and cache) the Stage 1 prompt | LLM chain per provider"""
+    return build_transaction_blocks_prompt | get_preprocessing_llm(provider=provider)
 
 
-def split_text_intelligently(text: str, max_chunk_size: int = 8000) -> list:
+def _slice_oversized_line(line: str, max_chunk_tokens: int) -> list:
+    """
+    Hard-slice a single line that exceeds the chunk budget on its own
+
+    Breaks at the last whitespace inside each window so words stay intact.
+    Guarantees bounded chunk size even for pathological single-line input
+    that would otherwise blow the model's context.
+    """
+    max_chars = max_chunk_tokens * 4  # mirrors the ~4 chars/token heuristic
+    pieces = []
+    start = 0
+    length = len(line)
+    while start < length:
+        end = min(start + max_chars, length)
+        if end < length:
+            cut = line.rfind(' ', start + 1, end)
+            if cut > start:
+                end = cut
+        piece = line[start:end].strip()
+        if piece:
+            pieces.append(piece)
+        start = end
+    return pieces
+
+def split_text_intelligently(text: str, max_chunk_tokens: int = MAX_CHUNK_TOKENS) -> list:
     """
     Split text into chunks using intelligent boundary detection
-    
+
+    Chunk budgets are measured in tokens rather than characters, so chunks
+    pack to the model's real context budget instead of a chars-per-token
+    guess that under-fills (extra LLM calls) or over-fills (truncated output).
+
     Args:
         text: Raw text to split
-        max_chunk_size: Maximum characters per chunk
-        
+        max_chunk_tokens: Maximum tokens per chunk
+
     Returns:
         List of text chunks that respect data boundaries
     """
-    
+
     # First try page-based splitting if PAGE markers exist
     if '--- PAGE' in text:
         page_chunks = []
         pages = text.split('--- PAGE')
-        
+
         for i, page in enumerate(pages):
             if i == 0 and page.strip():
                 page_chunks.append(page.strip())
             elif i > 0:
                 page_chunks.append(('--- PAGE' + page).strip())
-        
+
         # Check if page chunks are reasonable size
-        oversized_chunks = [chunk for chunk in page_chunks if len(chunk) > max_chunk_size]
+        oversized_chunks = [chunk for chunk in page_chunks if _count_tokens(chunk) > max_chunk_tokens]
         if not oversized_chunks:
             return [chunk for chunk in page_chunks if chunk]
     
-    # Fallback to intelligent character-based chunking
+    # Fallback to intelligent character-based chunking.
+    # Buffers are kept as part lists with a running length so each chunk is
+    # joined exactly once instead of re-concatenated per paragraph (O(N) not O(N^2)).
     chunks = []
-    current_chunk = ""
-    
+    current_parts = []
+    current_len = 0
+
     # Split by paragraphs (double newlines) first
     paragraphs = text.split('\n\n')
-    
+
     for paragraph in paragraphs:
         paragraph = paragraph.strip()
         if not paragraph:
             continue
-            
+
         # Check if adding this paragraph would exceed limit
-        potential_chunk = current_chunk + '\n\n' + paragraph if current_chunk else paragraph
-        
-        if len(potential_chunk) <= max_chunk_size:
-            current_chunk = potential_chunk
+        # (token count computed once per paragraph, separator counted as 1)
+        paragraph_tokens = _count_tokens(paragraph)
+        add_tokens = paragraph_tokens + (1 if current_parts else 0)
+
+        if current_len + add_tokens <= max_chunk_tokens:
+            current_parts.append(paragraph)
+            current_len += add_tokens
         else:
             # Current chunk is full, save it
-            if current_chunk:
-                chunks.append(current_chunk)
-            
+            if current_parts:
+                chunks.append('\n\n'.join(current_parts))
+
             # Handle oversized paragraphs
-            if len(paragraph) > max_chunk_size:
+            if paragraph_tokens > max_chunk_tokens:
                 # Split oversized paragraph by sentences/lines
-                lines = paragraph.split('\n')
-                temp_chunk = ""
-                
-                for line in lines:
-                    if len(temp_chunk + '\n' + line) <= max_chunk_size:
-                        temp_chunk = temp_chunk + '\n' + line if temp_chunk else line
+                temp_parts = []
+                temp_len = 0
+
+                for line in paragraph.split('\n'):
+                    line_tokens = _count_tokens(line)
+
+                    # A single line over budget gets hard-sliced into its own chunks
+                    if line_tokens > max_chunk_tokens:
+                        if temp_parts:
+                            chunks.append('\n'.join(temp_parts))
+                            temp_parts = []
+                            temp_len = 0
+                        chunks.extend(_slice_oversized_line(line, max_chunk_tokens))
+                        continue
+
+                    add_line_tokens = line_tokens + (1 if temp_parts else 0)
+                    if temp_len + add_line_tokens <= max_chunk_tokens:
+                        temp_parts.append(line)
+                        temp_len += add_line_tokens
                     else:
-                        if temp_chunk:
-                            chunks.append(temp_chunk)
-                        temp_chunk = line
-                
-                current_chunk = temp_chunk
+                        if temp_parts:
+                            chunks.append('\n'.join(temp_parts))
+                        temp_parts = [line]
+                        temp_len = line_tokens
+
+                current_parts = ['\n'.join(temp_parts)] if temp_parts else []
+                current_len = temp_len
             else:
-                current_chunk = paragraph
-    
+                current_parts = [paragraph]
+                current_len = paragraph_tokens
+
     # Add final chunk
-    if current_chunk:
-        chunks.append(current_chunk)
-    
+    if current_parts:
+        chunks.append('\n\n'.join(current_parts))
+
     # Ensure no empty chunks
     return [chunk.strip() for chunk in chunks if chunk.strip()]
 
+async def astream_transaction_blocks(raw_text: str, model_provider: str = None):
+    """
+    Stage 1 (streaming): yield complete transaction blocks as tokens arrive
+
+    Instead of waiting for each chunk's full response, tokens are buffered and
+    every completed TRANSACTION_START...TRANSACTION_END block is yielded as
+    soon as its end marker streams in, so downstream parsing can overlap with
+    generation. Chunks stream concurrently, each holding a provider-limiter
+    slot so every chunk is charged as one request against the RPM/TPM window;
+    block order across chunks is arbitrary, which is fine because each block
+    is parsed independently.
+
+    Args:
+        raw_text: Raw text from PDF extraction
+        model_provider: "openai" or "anthropic" (defaults to env LLM_PROVIDER)
+
+    Yields:
+        Complete transaction block strings, markers included
+    """
+    chain = _get_blocks_chain(model_provider)
+    limiter = get_limiter(model_provider)
+
+    chunks = split_text_intelligently(raw_text, max_chunk_tokens=MAX_CHUNK_TOKENS)
+    print(f"Stage 1: Streaming {len(chunks)} chunks")
+
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()  # Per-producer sentinel
+
+    async def produce(i: int, chunk: str):
+        buffer = ""
+        try:
+            async with limiter.slot(estimated_tokens=_count_tokens(chunk)):
+                async for token in chain.astream({"text": chunk}):
+                    buffer += token.content
+
+                    # Emit every finished block currently sitting in the buffer
+                    while True:
+                        end = buffer.find('TRANSACTION_END')
+                        if end == -1:
+                            break
+                        end += len('TRANSACTION_END')
+                        start = buffer.find('TRANSACTION_START')
+                        if start == -1 or start > end:
+                            # Orphaned end marker; discard up to it
+                            buffer = buffer[end:]
+                            continue
+                        await queue.put(buffer[start:end])
+                        buffer = buffer[end:]
+        except Exception as chunk_error:
+            print(f"Stage 1: Streaming chunk {i+1} failed: {str(chunk_error)}")
+        finally:
+            await queue.put(done)
+
+    producers = [asyncio.create_task(produce(i, chunk)) for i, chunk in enumerate(chunks)]
+    try:
+        remaining = len(producers)
+        while remaining:
+            item = await queue.get()
+            if item is done:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        for producer in producers:
+            producer.cancel()
+        await asyncio.gather(*producers, return_exceptions=True)
+
 def run_chain_extract_transaction_lines(raw_text: str, model_provider: str = None) -> str:
     """
     Stage 1: Clean and structure raw PDF text for transaction extraction
-    
+
     Args:
         raw_text: Raw text from PDF extraction
         model_provider: "openai" or "anthropic" (defaults to env LLM_PROVIDER)
-        
+
     Returns:
         Clean, structured text with transaction blocks
     """
     try:
-        # Get LLM instance optimized for preprocessing
-        llm = get_preprocessing_llm(provider=model_provider)
-        
-        # Create chain: Prompt → LLM
-        chain = build_transaction_blocks_prompt | llm
-        
+        chain = _get_blocks_chain(model_provider)
+
         # Split text into chunks to avoid output token limits
-        # Note: Stage 1 expands text ~3x, so use smaller chunk size
-        chunks = split_text_intelligently(raw_text, max_chunk_size=3000)
+        chunks = split_text_intelligently(raw_text, max_chunk_tokens=MAX_CHUNK_TOKENS)
+        print(f"Stage 1: Processing {len(chunks)} chunks")
+
+        # Batch chunk calls; the runnable fans them out concurrently under the hood
+        results = chain.batch(
+            [{"text": chunk} for chunk in chunks],
+            config={"max_concurrency": MAX_CONCURRENT_CHUNKS},
+            return_exceptions=True,
+        )
+
+        return _merge_chunk_results(chunks, results)
+
+    except Exception as e:
+        print(f"Stage 1 preprocessing failed: {str(e)}")
+        return raw_text  # Fallback to original text
+
+async def arun_chain_extract_transaction_lines(raw_text: str, model_provider: str = None) -> str:
+    """Async variant of run_chain_extract_transaction_lines (per-call rate limiting)"""
+    try:
+        chain = _get_blocks_chain(model_provider)
+        limiter = get_limiter(model_provider)
+
+        chunks = split_text_intelligently(raw_text, max_chunk_tokens=MAX_CHUNK_TOKENS)
         print(f"Stage 1: Processing {len(chunks)} chunks")
-        
-        # Process each chunk
-        processed_chunks = []
-        for i, chunk in enumerate(chunks):
-            try:
-                print(f"Stage 1: Processing chunk {i+1}/{len(chunks)}")
-                result = chain.invoke({"text": chunk})
-                processed_chunks.append(result.content)
-            except Exception as chunk_error:
-                print(f"Stage 1: Chunk {i+1} failed: {str(chunk_error)}")
-                # Include original chunk as fallback
-                processed_chunks.append(chunk)
-        
-        # Merge all processed chunks
-        merged_result = "\n\n".join(processed_chunks)
-        
-        print(f"Stage 1: Successfully processed {len(chunks)} chunks")
-        return merged_result
-        
+
+        # One limiter.run per chunk so the RPM window counts every provider
+        # call and the limiter's semaphore caps the fan-out
+        results = await asyncio.gather(
+            *[
+                limiter.run(
+                    chain.ainvoke,
+                    {"text": chunk},
+                    estimated_tokens=_count_tokens(chunk),
+                )
+                for chunk in chunks
+            ],
+            return_exceptions=True,
+        )
+
+        return _merge_chunk_results(chunks, results)
+
     except Exception as e:
         print(f"Stage 1 preprocessing failed: {str(e)}")
         return raw_text  # Fallback to original text
+
+def _merge_chunk_results(chunks: list, results: list) -> str:
+    """Merge batch results in input order; failed chunks fall back to original text"""
+    processed_chunks = []
+    for i, result in enumerate(results):
+        if isinstance(result, Exception):
+            print(f"Stage 1: Chunk {i+1} failed: {str(result)}")
+            # Include original chunk as fallback
+            processed_chunks.append(chunks[i])
+        else:
+            processed_chunks.append(result.content)
+
+    merged_result = "\n\n".join(processed_chunks)
+
+    print(f"Stage 1: Successfully processed {len(chunks)} chunks")
+    return merged_result
@@ -3,6 +3,7 @@ LLM Configuration for supporting multiple providers (OpenAI & Anthropic)
 """
 
 import os
+from functools import lru_cache
 from typing import Union
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
@@ -35,19 +36,29 @@ class LLMConfig:
 def get_llm(provider: str = None, model_tier: str = "default") -> Union[ChatOpenAI, ChatAnthropic]:
     """
     Get LLM instance based on provider and model tier
-    
+
+    Instances are cached per (provider, model_tier) so repeated calls reuse
+    the underlying HTTP client and its keep-alive connection pool instead of
+    re-doing TLS setup on every stage invocation.
+
     Args:
         provider: "openai" or "anthropic" (defaults to env LLM_PROVIDER or "openai")
         model_tier: "default", "fast", or "advanced"
-    
+
     Returns:
         Configured LLM instance
     """
-    
-    # Determine provider
+
+    # Determine provider before the cache lookup so the key is canonical
     if provider is None:
         provider = os.getenv("LLM_PROVIDER", LLMConfig.OPENAI)
-    
+
+    return _build_llm(provider, model_tier)
+
+@lru_cache(maxsize=8)
+def _build_llm(provider: str, model_tier: str) -> Union[ChatOpenAI, ChatAnthropic]:
+    """Construct (and cache) the client for a resolved provider/tier pair"""
+
     # Get model name
     model_name = LLMConfig.MODELS[provider][model_tier]
     
@@ -0,0 +1,65 @@
+from langchain.prompts import PromptTemplate
+
+# Combined Stage 0+1: clean raw PDF text and emit transaction blocks in one pass
+clean_and_format_prompt = PromptTemplate(
+    input_variables=["text"],
+    template="""
+You are a bank statement preprocessor. In a SINGLE pass you must clean raw PDF
+text AND format the surviving transaction data into structured blocks.
+
+INPUT: Raw, messy text extracted from a bank statement PDF
+OUTPUT: Formatted transaction blocks only.
+
+STEP 1 - DETERMINE ACCOUNT TYPE:
+Look for indicators such as:
+- "Credit Card", "CHASE FREEDOM", "Card Services" → CREDIT_CARD
+- "Checking", "College Checking", "Debit" → DEBIT_CHECKING
+- "Savings" → SAVINGS
+Use this to set the SOURCE field for all transactions.
+
+STEP 2 - IGNORE NON-TRANSACTION CONTENT:
+- Legal disclaimers, terms of service, account agreements and policy text
+- Website URLs, phone numbers, customer service information
+- Page headers, footers, page numbers, blank page indicators
+- Payment instructions, credit rights explanations, interest rate tables
+- Personal information (account holder names, addresses)
+
+STEP 3 - FORMAT EVERY TRANSACTION AS A BLOCK:
+TRANSACTION_START
+DATE: xx/xx/xx
+AMOUNT: xx.xx
+SOURCE: CREDIT_CARD or DEBIT_CHECKING or SAVINGS
+TRANSACTION_TYPE: INCOME or EXPENSE
+DESCRIPTION: xx
+TRANSACTION_END
+
+TRANSACTION TYPE RULES:
+For CREDIT_CARD accounts:
+- INCOME: Negative amounts
+- EXPENSE: Positive amounts
+
+For DEBIT_CHECKING accounts:
+- INCOME: Positive amounts
+- EXPENSE: Negative amounts
+
+CRITICAL RULES:
+- Use consistent field names (DATE, AMOUNT, SOURCE, TRANSACTION_TYPE, DESCRIPTION)
+- PRESERVE ALL ORIGINAL DATA. DO NOT AUGMENT OR INFER, JUST FORMAT EXISTING DATA.
+- Keep amounts with proper signs based on account type
+- Do NOT create JSON - just clean, structured text.
+- Delete any block with a zero amount, missing date, missing description,
+  missing source, or a transaction type inconsistent with the source.
+
+EXAMPLE:
+TRANSACTION_START
+DATE: 07/15/25
+AMOUNT: 5.65
+SOURCE: CREDIT_CARD
+TRANSACTION_TYPE: EXPENSE
+DESCRIPTION: DD *DOORDASH FLOUR+WAT 855-431-0459 CA
+TRANSACTION_END
+
+RAW TEXT TO PROCESS:
+{text}
+"""
+)
@@ -1,9 +1,12 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.routes import root, auth
 from app.routes import transactions
 from app.routes import upload
 
-app = FastAPI()
+# orjson serializes responses at C speed and handles datetime/UUID natively,
+# which matters most for /transactions/get-all payloads that grow with history
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Register routers
 app.include_router(root.router)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Float, String, DateTime
+from sqlalchemy import Column, Float, Index, String, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.schema import ForeignKey
@@ -8,6 +8,17 @@ from datetime import datetime
 
 class TransactionModel(Base):
     __tablename__ = "transactions"
+    # Composite index: serves the per-user filter and timestamp-ordered listings.
+    # The unique index rejects re-uploaded duplicates at the DB level, so the
+    # insert path never needs a per-row existence SELECT.
+    __table_args__ = (
+        Index("ix_transactions_user_id_timestamp", "user_id", "timestamp"),
+        Index(
+            "uq_transactions_dedup",
+            "user_id", "timestamp", "amount", "description",
+            unique=True,
+        ),
+    )
 
     # Transaction information
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False)
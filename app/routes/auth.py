@@ -11,21 +11,27 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
+
+def get_user_repo():
+    """User-store dependency: tests swap it via app.dependency_overrides"""
+    return crud_user
+
+
 @router.post("/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def register_user(user_in: UserCreate, db: Session = Depends(get_db)):
-    existing_user = crud_user.get_user_by_username(db, user_in.username)
+def register_user(user_in: UserCreate, db: Session = Depends(get_db), users=Depends(get_user_repo)):
+    existing_user = users.get_user_by_username(db, user_in.username)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already exists",
         )
 
-    user = crud_user.create_user(db, user_in)
+    user = users.create_user(db, user_in)
     return user
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = crud_user.get_user_by_username(db, form_data.username)
+def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db), users=Depends(get_user_repo)):
+    user = users.get_user_by_username(db, form_data.username)
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect username or password")
     
@@ -35,6 +41,11 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     access_token = create_access_token(data={"sub": str(user.id)})
     return {"access_token": access_token, "token_type": "bearer"}
 
-@router.get("/me", response_model=UserOut)
+@router.get("/me", response_model=None)
 def read_users_me(current_user: User = Depends(get_current_user)):
-    return current_user
+    # current_user is a trusted DB row; model_construct skips re-validation
+    return UserOut.model_construct(
+        username=current_user.username,
+        name=current_user.name,
+        created_at=current_user.created_at,
+    )
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
 
@@ -25,10 +26,28 @@ def create_transaction(
     return transaction
 
 
-@router.get("/get-all", response_model=list[TransactionOut])
+# response_model intentionally omitted: FastAPI would re-validate the
+# constructed models, undoing the model_construct savings
+@router.get("/get-all", response_model=None)
 def read_user_transactions(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     transactions = crud_transaction.get_transactions(db, user_id=current_user.id)
-    return transactions
+    # Rows come straight from our own DB, so skip the TransactionBase
+    # validators and FastAPI's jsonable_encoder walk entirely: build plain
+    # dicts and hand them to orjson, which serializes UUID and datetime
+    # natively at C speed. Only safe because the data is trusted.
+    return ORJSONResponse([
+        {
+            "id": t.id,
+            "user_id": t.user_id,
+            "amount": t.amount,
+            "description": t.description,
+            "category": t.category,
+            "transaction_type": t.transaction_type,
+            "source": t.source,
+            "timestamp": t.timestamp,
+        }
+        for t in transactions
+    ])
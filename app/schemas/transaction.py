@@ -1,8 +1,19 @@
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, field_validator, model_validator
 from typing import Optional, Literal
 from datetime import datetime
 from uuid import UUID
 
+# Sign/type/source consistency as a lookup table: key is
+# (source, amount > 0, transaction_type) and the value is the error for that
+# invalid combination. Valid combinations (and all savings rows) simply miss.
+# One dict probe per row replaces the old branch tree in the model validator.
+_SIGN_RULE_ERRORS = {
+    ("credit", False, "expense"): "Credit transactions must have a negative amount for income and positive for expense.",
+    ("credit", True, "income"): "Credit transactions must be type expense.",
+    ("debit", True, "expense"): "Positive amounts from debit/savings must be income.",
+    ("debit", False, "income"): "Negative amounts from debit/savings must be expense.",
+}
+
 class TransactionBase(BaseModel):
     amount: float
     description: str
@@ -27,20 +38,11 @@ class TransactionBase(BaseModel):
 
     @model_validator(mode="after")
     def validate_transaction_logic(self) -> "TransactionBase":
-        if self.source == "credit":
-            if self.amount < 0 and self.transaction_type != "income":
-                raise ValueError("Credit transactions must have a negative amount for income and positive for expense.")
-            if self.amount > 0 and self.transaction_type != "expense":
-                raise ValueError("Credit transactions must be type expense.")
-            if self.amount == 0:
-                raise ValueError("Credit transactions must have a non-zero amount.")
-
-        if self.source == "debit":
-            if self.amount > 0 and self.transaction_type != "income":
-                raise ValueError("Positive amounts from debit/savings must be income.")
-            if self.amount < 0 and self.transaction_type != "expense":
-                raise ValueError("Negative amounts from debit/savings must be expense.")
-
+        # amount == 0 is already rejected by the field validator, so the
+        # sign is always meaningful here
+        error = _SIGN_RULE_ERRORS.get((self.source, self.amount > 0, self.transaction_type))
+        if error:
+            raise ValueError(error)
         return self
 
 
@@ -49,9 +51,8 @@ class TransactionCreate(TransactionBase):
 
 
 class TransactionOut(TransactionBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: UUID
     user_id: UUID
     timestamp: datetime
-
-    class Config:
-        from_attributes = True
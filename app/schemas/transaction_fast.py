@@ -0,0 +1,44 @@
+"""
+msgspec mirror of TransactionBase for fast batch validation of LLM output
+
+msgspec validates in C at several times Pydantic v2 throughput, which matters
+when a single PDF produces hundreds of transaction dicts. The cross-field
+sign rules from TransactionBase.validate_transaction_logic live here as a
+plain function.
+"""
+
+from datetime import datetime
+from typing import Literal, Optional
+
+import msgspec
+
+
+class Transaction(msgspec.Struct):
+    amount: float
+    description: str
+    transaction_type: Literal["income", "expense"]
+    source: Literal["credit", "debit", "savings"]
+    category: Optional[str] = None
+    timestamp: Optional[datetime] = None
+
+
+def passes_transaction_rules(tx: Transaction) -> bool:
+    """Cross-field checks mirroring TransactionBase's validators"""
+    if not tx.description.strip():
+        return False
+    if tx.amount == 0:
+        return False
+
+    if tx.source == "credit":
+        if tx.amount < 0 and tx.transaction_type != "income":
+            return False
+        if tx.amount > 0 and tx.transaction_type != "expense":
+            return False
+
+    if tx.source == "debit":
+        if tx.amount > 0 and tx.transaction_type != "income":
+            return False
+        if tx.amount < 0 and tx.transaction_type != "expense":
+            return False
+
+    return True
@@ -1,7 +1,21 @@
-from pydantic import BaseModel, constr, field_validator
+import re
+
+from pydantic import BaseModel, ConfigDict, constr, field_validator
 from uuid import UUID
 from datetime import datetime
 
+# Compiled once: each rule becomes one C-level scan instead of a Python
+# per-character generator pass. The letter check stays out of the constr
+# pattern on purpose: a (?=.*[A-Za-z]) lookahead is unsupported by
+# pydantic v2's Rust regex engine, and folding it in would collapse the
+# per-rule error messages into one generic pattern mismatch.
+_LETTER_RE = re.compile(r"[^\W\d_]")  # any unicode letter
+_DIGIT_RE = re.compile(r"\d")
+# frozenset.isdisjoint iterates in C and short-circuits on the first hit,
+# with no regex-engine setup for what is just a character-class membership test
+_SPECIAL_CHARS = frozenset("!@#$%^&*()_+-=[]{}|;:,.<>?")
+_NAME_CHARS_RE = re.compile(r"^(?:[^\W\d_]|[ \-])+$")  # letters, spaces, hyphens
+
 class UserCreate(BaseModel):
     username: constr(min_length=3, max_length=20, pattern=r"^[a-zA-Z0-9_]+$")
     password: str
@@ -10,39 +24,40 @@ class UserCreate(BaseModel):
     @field_validator("username")
     @classmethod
     def username_must_contain_letter(cls, v: str) -> str:
-        if not any(char.isalpha() for char in v):
+        if not _LETTER_RE.search(v):
             raise ValueError("Username must contain at least one letter.")
         return v
-    
+
     @field_validator("password")
     @classmethod
     def password_must_contain_letter(cls, v: str) -> str:
-        if not any(char.isalpha() for char in v):
+        if not _LETTER_RE.search(v):
             raise ValueError("Password must contain at least one letter.")
-        
+
         # Password must contain at least one number and one special character
-        if not any(char.isdigit() for char in v):
+        if not _DIGIT_RE.search(v):
             raise ValueError("Password must contain at least one number.")
-        if not any(char in "!@#$%^&*()_+-=[]{}|;:,.<>?" for char in v):
+        if _SPECIAL_CHARS.isdisjoint(v):
             raise ValueError("Password must contain at least one special character.")
         return v
-    
+
     @field_validator("name")
     @classmethod
     def name_must_contain_letter(cls, v: str) -> str:
-        if not any(char.isalpha() for char in v):
+        if not _LETTER_RE.search(v):
             raise ValueError("Name must contain at least one letter.")
-        
+
         # Check that name only contains letters, spaces, and hyphens
-        if not all(char.isalpha() or char == ' ' or char == '-' for char in v):
+        if not _NAME_CHARS_RE.match(v):
             raise ValueError("Name must only contain letters, spaces, and hyphens.")
         return v
 
 
 class UserOut(BaseModel):
+    # orm_mode is the pydantic v1 name and is ignored by v2; from_attributes
+    # is what actually enables validating ORM objects
+    model_config = ConfigDict(from_attributes=True)
+
     username: str
     name: str
     created_at: datetime
-
-    class Config:
-        orm_mode = True
@@ -1,11 +1,94 @@
 # app/services/llm.py
-from typing import List
-from app.llm.chains.format_transactions import run_chain_extract_transaction_lines
-from app.llm.chains.build_transactions import run_chain_lines_to_transactions
-from app.llm.chains.clean_text import run_chain_clean_text
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import List, Tuple
 
+from app.llm.chains.format_transactions import (
+    arun_chain_extract_transaction_lines,
+    astream_transaction_blocks,
+)
+from app.llm.chains.build_transactions import (
+    MIN_DETERMINISTIC_PARSE_RATIO,
+    arun_chain_lines_to_transactions,
+    parse_transaction_blocks,
+)
+from app.llm.chains.clean_and_format import arun_chain_clean_and_format
+from app.llm.chains.clean_text import CLEAN_CONFIDENCE_THRESHOLD, deterministic_clean
 
-def call_llm_to_extract_transactions(
+# Re-uploading the same statement is common (retries, duplicate submissions);
+# caching the final transaction list by input hash skips all LLM round-trips
+# on a repeat. In-process LRU with a TTL: entries die with the worker, which
+# is acceptable for a cost/latency cache.
+_CACHE_MAX_ENTRIES = 256
+_CACHE_TTL_SECONDS = 24 * 60 * 60
+_result_cache: OrderedDict = OrderedDict()  # key -> (expiry, transactions)
+
+
+def _cache_key(raw_text: str, model_provider: str = None) -> str:
+    digest = hashlib.blake2b(raw_text.encode(), digest_size=16).hexdigest()
+    return f"{digest}:{model_provider or ''}"
+
+
+def _cache_get(key: str):
+    entry = _result_cache.get(key)
+    if entry is None:
+        return None
+    expiry, transactions = entry
+    if time.monotonic() > expiry:
+        del _result_cache[key]
+        return None
+    _result_cache.move_to_end(key)
+    return transactions
+
+
+def _cache_put(key: str, transactions: List[dict]) -> None:
+    _result_cache[key] = (time.monotonic() + _CACHE_TTL_SECONDS, transactions)
+    _result_cache.move_to_end(key)
+    while len(_result_cache) > _CACHE_MAX_ENTRIES:
+        _result_cache.popitem(last=False)
+
+
+async def _extract_transactions_streaming(
+    cleaned_text: str, model_provider: str = None
+) -> Tuple[List[dict], int]:
+    """
+    Overlap Stage 1 generation with Stage 2 parsing.
+
+    A producer task streams Stage 1 output and pushes each completed
+    transaction block onto a queue; the consumer parses blocks
+    deterministically as they arrive, so Stage 2 work is hidden behind
+    Stage 1's streaming latency.
+
+    Returns:
+        (parsed transactions, number of blocks seen)
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            async for block in astream_transaction_blocks(cleaned_text, model_provider=model_provider):
+                await queue.put(block)
+        finally:
+            await queue.put(None)  # Sentinel: stream exhausted
+
+    producer = asyncio.create_task(produce())
+
+    transactions: List[dict] = []
+    blocks_seen = 0
+    while True:
+        block = await queue.get()
+        if block is None:
+            break
+        blocks_seen += 1
+        transactions.extend(parse_transaction_blocks(block))
+
+    await producer
+    return transactions, blocks_seen
+
+
+async def acall_llm_to_extract_transactions(
     raw_text: str,
     model_provider: str = None
 ) -> List[dict]:
@@ -14,11 +97,63 @@ def call_llm_to_extract_transactions(
     1. Extract transaction-like lines from raw PDF text
     2. Convert each line into a structured transaction dict
 
+    When the deterministic Stage 0 clean is confident, Stage 1 output is
+    streamed and parsed block-by-block as it arrives. Otherwise cleaning
+    and block formatting are fused into one LLM pass, since both run on
+    the same fast tier and separate calls would double the round-trips.
+
+    Runs natively on the caller's event loop so async route handlers don't
+    block a worker thread for the duration of the LLM calls.
+
     Args:
         raw_text: messy PDF text
         model_provider: 'openai' or 'anthropic'
     """
-    cleaned_lines = run_chain_clean_text(raw_text, model_provider=model_provider)
-    transaction_blocks = run_chain_extract_transaction_lines(cleaned_lines, model_provider=model_provider)
-    completed_transactions = run_chain_lines_to_transactions(transaction_blocks, model_provider=model_provider)
+    cache_key = _cache_key(raw_text, model_provider)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        print(f"Pipeline: Cache hit ({len(cached)} transactions)")
+        return list(cached)
+
+    cleaned_text, confidence = deterministic_clean(raw_text)
+
+    # Rate limiting happens inside the chain modules, one limiter charge per
+    # provider call, so concurrent uploads share one RPM/TPM window
+
+    if confidence >= CLEAN_CONFIDENCE_THRESHOLD:
+        print(f"Pipeline: Deterministic Stage 0 (confidence {confidence:.2f})")
+        try:
+            transactions, blocks_seen = await _extract_transactions_streaming(
+                cleaned_text, model_provider=model_provider
+            )
+            if blocks_seen and len(transactions) >= blocks_seen * MIN_DETERMINISTIC_PARSE_RATIO:
+                print(f"Pipeline: Parsed {len(transactions)}/{blocks_seen} streamed blocks")
+                _cache_put(cache_key, transactions)
+                return transactions
+            print(f"Pipeline: Streaming parsed {len(transactions)}/{blocks_seen} blocks, falling back")
+        except Exception as e:
+            print(f"Pipeline: Streaming path failed: {str(e)}")
+
+        transaction_blocks = await arun_chain_extract_transaction_lines(
+            cleaned_text, model_provider=model_provider
+        )
+    else:
+        # Low confidence: one combined LLM pass replaces Stage 0 + Stage 1
+        transaction_blocks = await arun_chain_clean_and_format(
+            raw_text, model_provider=model_provider
+        )
+
+    completed_transactions = await arun_chain_lines_to_transactions(
+        transaction_blocks, model_provider=model_provider
+    )
+    if completed_transactions:
+        _cache_put(cache_key, completed_transactions)
     return completed_transactions
+
+
+def call_llm_to_extract_transactions(
+    raw_text: str,
+    model_provider: str = None
+) -> List[dict]:
+    """Sync wrapper around the async pipeline for non-async callers"""
+    return asyncio.run(acall_llm_to_extract_transactions(raw_text, model_provider=model_provider))
@@ -0,0 +1,127 @@
+# app/services/rate_limit.py
+import asyncio
+import contextlib
+import os
+import time
+from collections import deque
+from typing import Dict, Tuple
+
+# Provider profiles: requests/minute, tokens/minute, max in-flight calls.
+# Concurrency matches the chain-level fan-out cap so the limiter and the
+# abatch config agree on how many calls can be outstanding.
+PROVIDER_PROFILES: Dict[str, Tuple[int, int, int]] = {
+    "openai": (60, 150_000, 8),
+    "anthropic": (50, 80_000, 8),
+}
+_DEFAULT_PROFILE = (50, 80_000, 8)
+
+# Exponential backoff: 3 retries at 1s, 2s, 4s
+MAX_RETRIES = 3
+
+_WINDOW_SECONDS = 60.0
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Rate-limit (429) and overloaded (503) responses are worth retrying"""
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status in (429, 503):
+        return True
+    return "RateLimit" in type(error).__name__
+
+
+class ProviderLimiter:
+    """
+    Sliding-window RPM/TPM limiter with a concurrency cap for one provider.
+
+    Keeps fan-out from blowing past the provider's published limits, which
+    would otherwise trigger 429s and retry storms that cost more than the
+    waiting does. Calls that still hit a retryable error back off
+    exponentially up to MAX_RETRIES attempts.
+    """
+
+    def __init__(self, rpm: int, tpm: int, max_concurrency: int):
+        self._rpm = rpm
+        self._tpm = tpm
+        self._max_concurrency = max_concurrency
+        # asyncio primitives bind to the loop that first awaits them, so they
+        # are created lazily per running loop; the sync pipeline wrapper spins
+        # up a fresh loop per call via asyncio.run, and an eagerly-built
+        # semaphore would raise "bound to a different event loop" there
+        self._loop = None
+        self._semaphore = None
+        self._lock = None
+        self._events: deque = deque()  # (monotonic timestamp, tokens)
+        self._window_tokens = 0
+
+    def _bind_to_running_loop(self) -> None:
+        """(Re)create the loop-bound primitives for the current running loop
+
+        The window deque carries over: monotonic timestamps are valid across
+        loops, so RPM/TPM accounting survives sequential asyncio.run calls.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._lock = asyncio.Lock()
+
+    def _drop_expired(self, now: float) -> None:
+        while self._events and now - self._events[0][0] > _WINDOW_SECONDS:
+            _, tokens = self._events.popleft()
+            self._window_tokens -= tokens
+
+    async def _wait_for_window(self, tokens: int) -> None:
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self._drop_expired(now)
+                within_rpm = len(self._events) < self._rpm
+                within_tpm = self._window_tokens + tokens <= self._tpm
+                if within_rpm and (within_tpm or not self._events):
+                    self._events.append((now, tokens))
+                    self._window_tokens += tokens
+                    return
+                # Sleep until the oldest event leaves the window
+                wait = _WINDOW_SECONDS - (now - self._events[0][0]) + 0.05
+            await asyncio.sleep(max(wait, 0.05))
+
+    @contextlib.asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0):
+        """
+        Charge one request event and hold a concurrency slot for the body.
+
+        For streaming calls that cannot be retried as a unit; non-streaming
+        callers should prefer run(), which adds backoff on retryable errors.
+        """
+        self._bind_to_running_loop()
+        await self._wait_for_window(estimated_tokens)
+        async with self._semaphore:
+            yield
+
+    async def run(self, fn, *args, estimated_tokens: int = 0, **kwargs):
+        """Run one provider call under the rate window, concurrency cap and backoff"""
+        self._bind_to_running_loop()
+        for attempt in range(MAX_RETRIES + 1):
+            await self._wait_for_window(estimated_tokens)
+            async with self._semaphore:
+                try:
+                    return await fn(*args, **kwargs)
+                except Exception as e:
+                    if attempt < MAX_RETRIES and _is_retryable(e):
+                        delay = 2 ** attempt
+                        print(f"Rate limiter: retryable error ({e}), backing off {delay}s")
+                        await asyncio.sleep(delay)
+                        continue
+                    raise
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+
+
+def get_limiter(provider: str = None) -> ProviderLimiter:
+    """One shared limiter per provider so all pipelines see the same window"""
+    provider = provider or os.getenv("LLM_PROVIDER", "openai")
+    if provider not in _limiters:
+        rpm, tpm, max_concurrency = PROVIDER_PROFILES.get(provider, _DEFAULT_PROFILE)
+        _limiters[provider] = ProviderLimiter(rpm, tpm, max_concurrency)
+    return _limiters[provider]
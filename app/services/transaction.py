@@ -1,23 +1,60 @@
+import uuid
+
+import msgspec
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from app.models import TransactionModel
-from app.schemas.transaction import TransactionCreate
 from app.models import User
+from app.schemas.transaction_fast import Transaction, passes_transaction_rules
 
 def insert_transactions(transaction_dicts: list[dict], db: Session, user: User):
     """
-    Add validation with Pydantic before inserting
-    Handle duplicate detection
-    Log or batch insert for speed
+    Validate LLM-produced dicts with msgspec (C-level, much faster than
+    per-row Pydantic) and insert the valid ones with a single Core INSERT.
+    Skipping the unit-of-work machinery means no per-row ORM object or
+    flush-time state tracking; the driver gets one multi-values statement
+    (or a pipelined executemany) instead of N round-trips.
+    Invalid transactions are skipped.
     """
-    inserted_count = 0
+    rows = []
     for tx in transaction_dicts:
         try:
-            validated = TransactionCreate(**tx)
-            db.add(TransactionModel(**validated.model_dump(), user_id=user.id))
-            inserted_count += 1
-        except Exception as e:
+            validated = msgspec.convert(tx, Transaction, strict=False)
+        except msgspec.ValidationError as e:
             print(f"Skipping invalid tx: {e}")
-    db.commit()
-    return inserted_count
+            continue
+
+        if not passes_transaction_rules(validated):
+            print(f"Skipping invalid tx: {tx}")
+            continue
 
-    
+        rows.append({
+            "id": uuid.uuid4(),
+            "amount": validated.amount,
+            "description": validated.description,
+            "category": validated.category,
+            "transaction_type": validated.transaction_type,
+            "source": validated.source,
+            "timestamp": validated.timestamp,
+            "user_id": user.id,
+        })
+
+    if not rows:
+        return 0
+
+    # Duplicate detection happens in the DB: the uq_transactions_dedup index
+    # rejects re-uploaded rows and ON CONFLICT DO NOTHING drops them inside
+    # the same statement, so no per-row existence SELECTs are needed.
+    # RETURNING yields one id per row that actually inserted; executemany
+    # rowcount is not reliable on psycopg2 (supports_sane_multi_rowcount is
+    # False), so the count comes from the returned ids instead.
+    statement = (
+        insert(TransactionModel)
+        .on_conflict_do_nothing(
+            index_elements=["user_id", "timestamp", "amount", "description"]
+        )
+        .returning(TransactionModel.id)
+    )
+    inserted_ids = db.execute(statement, rows).scalars().all()
+    db.commit()
+    return len(inserted_ids)
@@ -1,21 +1,169 @@
 # tests/conftest.py
+import httpx
 import pytest
-from sqlalchemy import create_engine
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from app.main import app
 from app.models import Base  # Your shared Base
 from sqlalchemy.pool import StaticPool
 
-@pytest.fixture(scope="function")
-def db_session():
+
+# Call-phase budget for tests marked @pytest.mark.fast; override per run with
+# --fast-threshold when debugging on a loaded machine
+FAST_TEST_MAX_SECONDS = 0.3
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--fast-threshold",
+        type=float,
+        default=FAST_TEST_MAX_SECONDS,
+        help="Fail tests marked 'fast' whose call phase takes at least this many seconds",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "fast: test must finish its call phase under the --fast-threshold budget",
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    # Turn a slow pass into a failure so runtime regressions in mock-only
+    # tests surface immediately instead of silently accumulating
+    outcome = yield
+    report = outcome.get_result()
+    if report.when != "call" or not report.passed:
+        return
+    if item.get_closest_marker("fast") is None:
+        return
+    threshold = item.config.getoption("--fast-threshold")
+    if call.duration >= threshold:
+        report.outcome = "failed"
+        report.longrepr = (
+            f"{item.nodeid} is marked 'fast' but took {call.duration:.3f}s "
+            f"(budget {threshold:.3f}s)"
+        )
+
+
+@pytest.fixture(autouse=True, scope="session")
+def fast_password_hashing():
+    """
+    Swap the real KDF for a cheap consistent fake for the whole session.
+
+    bcrypt costs hundreds of milliseconds per call and no route test checks
+    hash strength — they only need register/login round trips to agree. The
+    fake pair is applied at the app call sites (crud create_user, login's
+    verify) plus the test helpers; test_security.py keeps the real functions
+    through its direct imports and still covers the actual KDF.
+    """
+    import app.crud.user as crud_user
+    import app.routes.auth as auth_routes
+    import tests.utils.mocks as mocks
+
+    def fake_hash(password: str) -> str:
+        return "h$" + password
+
+    def fake_verify(plain_password: str, hashed_password: str) -> bool:
+        return hashed_password == "h$" + plain_password
+
+    originals = [
+        (crud_user, "hash_password", crud_user.hash_password),
+        (mocks, "hash_password", mocks.hash_password),
+        (auth_routes, "verify_password", auth_routes.verify_password),
+    ]
+    crud_user.hash_password = fake_hash
+    mocks.hash_password = fake_hash
+    auth_routes.verify_password = fake_verify
+    yield
+    for module, name, original in originals:
+        setattr(module, name, original)
+
+
+@pytest.fixture(autouse=True)
+def _iso_overrides():
+    """
+    Snapshot and restore app.dependency_overrides around every test.
+
+    The overrides dict is the one piece of shared mutable state between
+    tests; sandboxing it here removes the need for per-test try/finally
+    cleanup and keeps tests independent under pytest-xdist workers.
+    """
+    snapshot = dict(app.dependency_overrides)
+    yield
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(snapshot)
+
+
+@pytest.fixture(scope="session")
+def client():
+    # One client (and one ASGI lifespan) for the whole session instead of a
+    # module-level TestClient per test file
+    with TestClient(app) as c:
+        # Warm the app here so the one-time first-request cost (middleware
+        # stack, schema caches) is charged to fixture setup rather than to
+        # whichever fast-budgeted test happens to run first on this worker
+        c.get("/auth/me")
+        yield c
+
+
+@pytest.fixture(scope="session")
+async def aclient():
+    # Calls the ASGI app directly on the test event loop: no sync-over-async
+    # portal thread hop per request like TestClient
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        # Same warmup rationale as the sync client fixture above
+        await c.get("/auth/me")
+        yield c
+
+@pytest.fixture(scope="session")
+def db_engine():
+    # One in-memory engine and one create_all per session (per xdist worker)
+    # instead of rebuilding the schema for every test
     engine = create_engine(
         "sqlite://",  # in-memory SQLite
         connect_args={"check_same_thread": False},
         poolclass=StaticPool
     )
-    TestingSessionLocal = sessionmaker(bind=engine)
+
+    # pysqlite emits COMMITs on its own schedule, which breaks the
+    # SAVEPOINT-based rollback isolation below; take over transaction
+    # control so BEGIN is issued exactly when SQLAlchemy says so
+    @event.listens_for(engine, "connect")
+    def _do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def db_session(db_engine):
+    # Each test runs inside an outer transaction that is rolled back at
+    # teardown; join_transaction_mode="create_savepoint" turns the test's
+    # own commit() calls into SAVEPOINT releases so the rollback still
+    # wipes everything. expire_on_commit=False keeps post-commit attribute
+    # assertions reading the instance dict instead of re-SELECTing.
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    TestingSessionLocal = sessionmaker(
+        bind=connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
     session = TestingSessionLocal()
     try:
         yield session
     finally:
         session.close()
+        transaction.rollback()
+        connection.close()
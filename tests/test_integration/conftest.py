@@ -0,0 +1,134 @@
+# tests/test_integration/conftest.py
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.core.security import get_current_user, hash_password
+from app.db.db import get_db
+from app.main import app
+from app.models.user import User
+from tests.utils.mocks import get_mock_db
+
+
+@pytest.fixture(scope="session")
+def default_password():
+    return "Password123!"
+
+
+@pytest.fixture(scope="session")
+def default_password_hash(default_password):
+    # bcrypt is deliberately CPU-expensive and these tests never check hash
+    # strength; hash the shared test password once per session, not per test
+    return hash_password(default_password)
+
+
+# Deterministic identities: nothing asserts on these values, and fixed ids
+# avoid a clock and RNG syscall per built user
+_USER_IDS = {"testuser": uuid.UUID(int=101), "txnuser": uuid.UUID(int=102), "txnuser2": uuid.UUID(int=103)}
+_FIXED_CREATED_AT = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def _build_user(username: str, name: str, password_hash: str) -> User:
+    user = User(username=username, name=name, hashed_password=password_hash)
+    user.id = _USER_IDS[username]
+    user.created_at = _FIXED_CREATED_AT
+    return user
+
+
+# Session-scoped users: the JWT flow tests only read these, so one instance
+# per session replaces near-identical per-test User construction
+@pytest.fixture(scope="session")
+def mock_user(default_password_hash):
+    return _build_user("testuser", "Test User", default_password_hash)
+
+
+@pytest.fixture(scope="session")
+def txn_user(default_password_hash):
+    return _build_user("txnuser", "Transaction User", default_password_hash)
+
+
+@pytest.fixture(scope="session")
+def mock_user_2(default_password_hash):
+    return _build_user("txnuser2", "Transaction User 2", default_password_hash)
+
+
+@pytest.fixture(scope="session")
+def shared_mock_db():
+    # get_mock_db is lru_cached already; the fixture makes the single shared
+    # instance explicit and hands tests a direct handle to it. Nothing in
+    # these tests asserts on its call history, so no per-test reset is needed.
+    return get_mock_db(user_exists=False)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "as_user(fixture_name): run the test with get_current_user overridden to the named user fixture",
+    )
+
+
+@pytest.fixture(autouse=True)
+def maybe_override_current_user(request):
+    """
+    Install the get_current_user override declaratively: tests tagged
+    @pytest.mark.as_user("mock_user") get that fixture's user without any
+    per-test override plumbing. Untagged tests pass straight through.
+    """
+    marker = request.node.get_closest_marker("as_user")
+    if marker is None:
+        yield
+        return
+    user = request.getfixturevalue(marker.args[0])
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.fixture
+def override_current_user():
+    """
+    Factory that points get_current_user at a given user for this test; the
+    override is popped at teardown so no test body needs try/finally.
+    """
+
+    def _override(user):
+        app.dependency_overrides[get_current_user] = lambda: user
+
+    yield _override
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.fixture
+def install_auth_mocks(monkeypatch, shared_mock_db):
+    """
+    Wire up the auth route collaborators in one call instead of a nested
+    with patch(...) stack per request.
+
+    monkeypatch.setattr touches each module attribute once and auto-reverts
+    at teardown, and the DB dependency goes through app.dependency_overrides
+    (restored by the autouse _iso_overrides fixture), so tests need no
+    try/finally plumbing. Call with exists=False for the registration phase
+    (username lookup misses, create_user returns the user) and re-call with
+    the default exists=True before logging in.
+    """
+
+    def _install(user, token, *, exists=True, mock_db=None):
+        # The crud layer is mocked out below, so the session-wide mock DB
+        # works for every scenario regardless of the exists flag
+        db = mock_db if mock_db is not None else shared_mock_db
+        app.dependency_overrides[get_db] = lambda: db
+        monkeypatch.setattr(
+            "app.routes.auth.crud_user.get_user_by_username",
+            lambda *a, **k: user if exists else None,
+        )
+        monkeypatch.setattr(
+            "app.routes.auth.crud_user.create_user", lambda *a, **k: user
+        )
+        monkeypatch.setattr("app.routes.auth.verify_password", lambda *a, **k: True)
+        monkeypatch.setattr(
+            "app.routes.auth.create_access_token", lambda *a, **k: token
+        )
+        return db
+
+    return _install
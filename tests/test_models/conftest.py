@@ -0,0 +1,80 @@
+# tests/test_models/conftest.py
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.models.budget import BudgetModel
+from app.models.insight import InsightModel
+from app.models.transaction import TransactionModel
+from app.models.user import User
+
+_NOW = datetime.now()
+
+
+@pytest.fixture
+def make_user(db_session):
+    """
+    Factory for the owning user a model test hangs its rows off.
+
+    Every model test used to repeat the same 4-line User insert + commit;
+    this flushes the user into the test's session in one call instead.
+    flush() assigns the primary key without closing the transaction, so the
+    test's own commit covers the user and its rows together.
+    """
+
+    def _make_user(username="user", name="Test User"):
+        user = User(
+            id=uuid.uuid4(),
+            username=username,
+            name=name,
+            hashed_password="hash",
+        )
+        db_session.add(user)
+        db_session.flush()
+        return user
+
+    return _make_user
+
+
+@pytest.fixture
+def make_related_rows(db_session):
+    """
+    Build one transaction, budget and insight for a user in a single flush.
+
+    The user relationship and cascade tests construct an identical trio of
+    related rows; sharing the factory keeps that in one place and pays one
+    add_all + flush instead of per-test copies.
+    """
+
+    def _make_related_rows(user):
+        transaction = TransactionModel(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            amount=100.0,
+            description="Test Transaction",
+            category="Food",
+            transaction_type="expense",
+            source="debit",
+            timestamp=_NOW,
+        )
+        budget = BudgetModel(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            amount=500.0,
+            category="Food",
+            description="Monthly food budget",
+            start_date=_NOW,
+            end_date=_NOW,
+            is_active=True,
+        )
+        insight = InsightModel(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            insight="You spend too much on food",
+        )
+        db_session.add_all([transaction, budget, insight])
+        db_session.flush()
+        return transaction, budget, insight
+
+    return _make_related_rows
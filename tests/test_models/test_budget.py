@@ -1,34 +1,35 @@
 from app.models.budget import BudgetModel
-from app.models.user import User
 from datetime import datetime, timedelta
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import selectinload
+from tests.utils.mocks import uuids
+from app.models.user import User
 import uuid
 import pytest
 
-def test_create_budget(db_session):
+# One wall-clock read per module: the tests only need plausible,
+# self-consistent dates, not fresh ones per row
+_NOW = datetime.now()
+_IN_30_DAYS = _NOW + timedelta(days=30)
+
+def test_create_budget(db_session, make_user):
     """Test basic budget creation with all required fields"""
-    user = User(
-        id=uuid.uuid4(),
-        username="budgetuser",
-        name="Budget User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="budgetuser")
 
-    budget = BudgetModel(
+    row = dict(
         id=uuid.uuid4(),
         user_id=user.id,
-        amount=100.00,  
+        amount=100.00,
         category="Food",
         description="Monthly food budget",
-        start_date=datetime.now(),
-        end_date=datetime.now() + timedelta(days=30),
+        start_date=_NOW,
+        end_date=_IN_30_DAYS,
         is_active=True,
-        created_at=datetime.now()
+        created_at=_NOW
     )
-    db_session.add(budget)
-    db_session.commit()
-    db_session.refresh(budget)
+    # INSERT ... RETURNING hands back the row with server defaults applied
+    # in one round-trip, replacing the post-commit refresh() SELECT
+    budget = db_session.scalars(insert(BudgetModel).returning(BudgetModel), [row]).one()
 
     # Test all fields are properly set
     assert budget.id is not None
@@ -42,10 +43,14 @@ def test_create_budget(db_session):
     assert budget.created_at is not None
     assert isinstance(budget.created_at, datetime)
 
-    # Test relationship to user
-    assert budget.user is not None
-    assert budget.user.id == user.id
-    assert budget.user.username == "budgetuser"
+    # Test relationship to user; no_autoflush skips the pointless
+    # pre-query flush check on the lazy load
+    with db_session.no_autoflush:
+        assert budget.user is not None
+        assert budget.user.id == user.id
+        assert budget.user.username == "budgetuser"
+
+    db_session.commit()
 
 def test_budget_foreign_key_constraint(db_session):
     """Test that budget requires valid user_id"""
@@ -56,115 +61,49 @@ def test_budget_foreign_key_constraint(db_session):
         amount=100.00,
         category="Food",
         description="Test budget",
-        start_date=datetime.now(),
-        end_date=datetime.now() + timedelta(days=30),
+        start_date=_NOW,
+        end_date=_IN_30_DAYS,
         is_active=True
     )
     
     db_session.add(budget)
     db_session.commit()
-    db_session.refresh(budget)
     
     # Verify budget exists but has no valid user relationship
     assert budget.id is not None
     assert budget.user_id is not None
     assert budget.user is None  # Relationship should be None since user doesn't exist
 
-def test_budget_required_fields(db_session):
-    """Test that required fields cannot be null"""
-    user = User(
-        id=uuid.uuid4(),
-        username="requireduser",
-        name="Required User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+# Complete, valid budget kwargs for the required-field cases; built once at
+# import since the dates are module constants anyway
+_BUDGET_BASE_KWARGS = dict(
+    amount=100.00,
+    category="Food",
+    description="Test budget",
+    start_date=_NOW,
+    end_date=_IN_30_DAYS,
+    is_active=True,
+)
 
-    # Test missing amount
-    budget_no_amount = BudgetModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        category="Food",
-        description="Test budget",
-        start_date=datetime.now(),
-        end_date=datetime.now() + timedelta(days=30),
-        is_active=True
-    )
-    db_session.add(budget_no_amount)
-    with pytest.raises(Exception):
-        db_session.commit()
-    db_session.rollback()
 
-    # Test missing category
-    budget_no_category = BudgetModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=100.00,
-        description="Test budget",
-        start_date=datetime.now(),
-        end_date=datetime.now() + timedelta(days=30),
-        is_active=True
-    )
-    db_session.add(budget_no_category)
-    with pytest.raises(Exception):
-        db_session.commit()
-    db_session.rollback()
+@pytest.mark.parametrize("missing", ["amount", "category", "description", "start_date", "end_date"])
+def test_budget_required_fields(db_session, make_user, missing):
+    """Test that each required field in turn cannot be null"""
+    user = make_user(username="requireduser")
 
-    # Test missing description
-    budget_no_description = BudgetModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=100.00,
-        category="Food",
-        start_date=datetime.now(),
-        end_date=datetime.now() + timedelta(days=30),
-        is_active=True
-    )
-    db_session.add(budget_no_description)
-    with pytest.raises(Exception):
-        db_session.commit()
-    db_session.rollback()
+    kwargs = dict(_BUDGET_BASE_KWARGS)
+    kwargs.pop(missing)
 
-    # Test missing start_date
-    budget_no_start = BudgetModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=100.00,
-        category="Food",
-        description="Test budget",
-        end_date=datetime.now() + timedelta(days=30),
-        is_active=True
-    )
-    db_session.add(budget_no_start)
-    with pytest.raises(Exception):
-        db_session.commit()
-    db_session.rollback()
-
-    # Test missing end_date
-    budget_no_end = BudgetModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=100.00,
-        category="Food",
-        description="Test budget",
-        start_date=datetime.now(),
-        is_active=True
-    )
-    db_session.add(budget_no_end)
+    # SAVEPOINT per case: the failing INSERT rolls back to the savepoint
+    # at flush time instead of tearing down the surrounding transaction
     with pytest.raises(Exception):
-        db_session.commit()
+        with db_session.begin_nested():
+            db_session.add(BudgetModel(id=uuid.uuid4(), user_id=user.id, **kwargs))
+            db_session.flush()
 
-def test_budget_cascade_delete(db_session):
+def test_budget_cascade_delete(db_session, make_user):
     """Test that deleting user cascades to budgets"""
-    user = User(
-        id=uuid.uuid4(),
-        username="cascadeuser",
-        name="Cascade User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="cascadeuser")
 
     budget = BudgetModel(
         id=uuid.uuid4(),
@@ -172,36 +111,29 @@ def test_budget_cascade_delete(db_session):
         amount=100.00,
         category="Food",
         description="Test budget",
-        start_date=datetime.now(),
-        end_date=datetime.now() + timedelta(days=30),
+        start_date=_NOW,
+        end_date=_IN_30_DAYS,
         is_active=True
     )
     db_session.add(budget)
-    db_session.commit()
+    db_session.flush()
 
     # Verify budget exists
-    assert db_session.query(BudgetModel).count() == 1
+    assert db_session.scalar(select(func.count()).select_from(BudgetModel)) == 1
 
     # Delete user
     db_session.delete(user)
     db_session.commit()
 
     # Verify budget is deleted
-    assert db_session.query(BudgetModel).count() == 0
+    assert db_session.scalar(select(func.count()).select_from(BudgetModel)) == 0
 
-def test_budget_date_validation(db_session):
+def test_budget_date_validation(db_session, make_user):
     """Test budget date logic and validation"""
-    user = User(
-        id=uuid.uuid4(),
-        username="dateuser",
-        name="Date User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="dateuser")
 
     # Test budget with start_date before end_date
-    start_date = datetime.now()
+    start_date = _NOW
     end_date = start_date + timedelta(days=30)
     
     valid_budget = BudgetModel(
@@ -219,16 +151,9 @@ def test_budget_date_validation(db_session):
 
     assert valid_budget.start_date < valid_budget.end_date
 
-def test_budget_active_status(db_session):
+def test_budget_active_status(db_session, make_user):
     """Test budget active status functionality"""
-    user = User(
-        id=uuid.uuid4(),
-        username="activeuser",
-        name="Active User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="activeuser")
 
     # Test active budget
     active_budget = BudgetModel(
@@ -237,12 +162,12 @@ def test_budget_active_status(db_session):
         amount=200.00,
         category="Transportation",
         description="Monthly transportation budget",
-        start_date=datetime.now(),
-        end_date=datetime.now() + timedelta(days=30),
+        start_date=_NOW,
+        end_date=_IN_30_DAYS,
         is_active=True
     )
     db_session.add(active_budget)
-    db_session.commit()
+    db_session.flush()
 
     # Test inactive budget
     inactive_budget = BudgetModel(
@@ -251,8 +176,8 @@ def test_budget_active_status(db_session):
         amount=150.00,
         category="Utilities",
         description="Monthly utilities budget",
-        start_date=datetime.now(),
-        end_date=datetime.now() + timedelta(days=30),
+        start_date=_NOW,
+        end_date=_IN_30_DAYS,
         is_active=False
     )
     db_session.add(inactive_budget)
@@ -261,16 +186,9 @@ def test_budget_active_status(db_session):
     assert active_budget.is_active is True
     assert inactive_budget.is_active is False
 
-def test_budget_default_values(db_session):
+def test_budget_default_values(db_session, make_user):
     """Test budget default values"""
-    user = User(
-        id=uuid.uuid4(),
-        username="defaultuser",
-        name="Default User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="defaultuser")
 
     # Test budget without specifying is_active (should default to True)
     budget_default = BudgetModel(
@@ -279,8 +197,8 @@ def test_budget_default_values(db_session):
         amount=300.00,
         category="Shopping",
         description="Monthly shopping budget",
-        start_date=datetime.now(),
-        end_date=datetime.now() + timedelta(days=30)
+        start_date=_NOW,
+        end_date=_IN_30_DAYS
         # is_active not specified, should default to True
     )
     db_session.add(budget_default)
@@ -289,41 +207,36 @@ def test_budget_default_values(db_session):
     assert budget_default.is_active is True
     assert budget_default.created_at is not None
 
-def test_budget_multiple_categories(db_session):
+def test_budget_multiple_categories(db_session, make_user):
     """Test creating budgets for different categories"""
-    user = User(
-        id=uuid.uuid4(),
-        username="multiuser",
-        name="Multi User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="multiuser")
 
     categories = ["Food", "Transportation", "Entertainment", "Utilities"]
-    budgets = []
-
-    for category in categories:
-        budget = BudgetModel(
-            id=uuid.uuid4(),
-            user_id=user.id,
-            amount=100.00 + len(budgets) * 50,  # Different amounts
-            category=category,
-            description=f"Monthly {category.lower()} budget",
-            start_date=datetime.now(),
-            end_date=datetime.now() + timedelta(days=30),
-            is_active=True
-        )
-        budgets.append(budget)
-        db_session.add(budget)
 
+    # Plain dict rows + one bulk insert: skips per-instance ORM bookkeeping
+    # and flushes all four budgets in a single statement
+    rows = [
+        {
+            "id": row_id,
+            "user_id": user.id,
+            "amount": 100.00 + i * 50,  # Different amounts
+            "category": category,
+            "description": f"Monthly {category.lower()} budget",
+            "start_date": _NOW,
+            "end_date": _IN_30_DAYS,
+            "is_active": True,
+        }
+        for i, (row_id, category) in enumerate(zip(uuids(len(categories)), categories))
+    ]
+    db_session.bulk_insert_mappings(BudgetModel, rows)
     db_session.commit()
 
     # Verify all budgets exist
-    assert db_session.query(BudgetModel).count() == 4
+    assert db_session.scalar(select(func.count()).select_from(BudgetModel)) == 4
     
-    # Verify relationships
-    db_session.refresh(user)
+    # Verify relationships: selectin-load the budgets together with the
+    # user fetch instead of refresh() plus a lazy-load SELECT
+    user = db_session.get(User, user.id, options=[selectinload(User.budgets)], populate_existing=True)
     assert len(user.budgets) == 4
 
     # Verify different amounts
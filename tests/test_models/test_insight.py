@@ -1,29 +1,29 @@
 from app.models.insight import InsightModel
-from app.models.user import User
 from datetime import datetime
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import selectinload
+from tests.utils.mocks import uuids
+from app.models.user import User
 import uuid
 import pytest
 
-def test_create_insight(db_session):
+# One wall-clock read per module: the tests only need a plausible
+# timestamp, not a fresh one per row
+_NOW = datetime.now()
+
+def test_create_insight(db_session, make_user):
     """Test basic insight creation with all required fields"""
-    user = User(
-        id=uuid.uuid4(),
-        username="insightuser",
-        name="Insight User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="insightuser")
 
-    insight = InsightModel(
+    row = dict(
         id=uuid.uuid4(),
         user_id=user.id,
         insight="You spend too much on food this month",
-        created_at=datetime.now()
+        created_at=_NOW
     )
-    db_session.add(insight)
-    db_session.commit()
-    db_session.refresh(insight)
+    # INSERT ... RETURNING hands back the row with server defaults applied
+    # in one round-trip, replacing the post-commit refresh() SELECT
+    insight = db_session.scalars(insert(InsightModel).returning(InsightModel), [row]).one()
 
     # Test all fields are properly set
     assert insight.id is not None
@@ -32,10 +32,14 @@ def test_create_insight(db_session):
     assert insight.created_at is not None
     assert isinstance(insight.created_at, datetime)
 
-    # Test relationship to user
-    assert insight.user is not None
-    assert insight.user.id == user.id
-    assert insight.user.username == "insightuser"
+    # Test relationship to user; no_autoflush skips the pointless
+    # pre-query flush check on the lazy load
+    with db_session.no_autoflush:
+        assert insight.user is not None
+        assert insight.user.id == user.id
+        assert insight.user.username == "insightuser"
+
+    db_session.commit()
 
 def test_insight_foreign_key_constraint(db_session):
     """Test that insight requires valid user_id"""
@@ -48,23 +52,15 @@ def test_insight_foreign_key_constraint(db_session):
     
     db_session.add(insight)
     db_session.commit()
-    db_session.refresh(insight)
     
     # Verify insight exists but has no valid user relationship
     assert insight.id is not None
     assert insight.user_id is not None
     assert insight.user is None  # Relationship should be None since user doesn't exist
 
-def test_insight_required_fields(db_session):
+def test_insight_required_fields(db_session, make_user):
     """Test that required fields cannot be null"""
-    user = User(
-        id=uuid.uuid4(),
-        username="requireduser",
-        name="Required User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="requireduser")
 
     # Test missing insight text
     insight_no_text = InsightModel(
@@ -74,18 +70,11 @@ def test_insight_required_fields(db_session):
     )
     db_session.add(insight_no_text)
     with pytest.raises(Exception):
-        db_session.commit()
+        db_session.flush()
 
-def test_insight_cascade_delete(db_session):
+def test_insight_cascade_delete(db_session, make_user):
     """Test that deleting user cascades to insights"""
-    user = User(
-        id=uuid.uuid4(),
-        username="cascadeuser",
-        name="Cascade User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="cascadeuser")
 
     insight = InsightModel(
         id=uuid.uuid4(),
@@ -93,28 +82,21 @@ def test_insight_cascade_delete(db_session):
         insight="Test insight for cascade delete"
     )
     db_session.add(insight)
-    db_session.commit()
+    db_session.flush()
 
     # Verify insight exists
-    assert db_session.query(InsightModel).count() == 1
+    assert db_session.scalar(select(func.count()).select_from(InsightModel)) == 1
 
     # Delete user
     db_session.delete(user)
     db_session.commit()
 
     # Verify insight is deleted
-    assert db_session.query(InsightModel).count() == 0
+    assert db_session.scalar(select(func.count()).select_from(InsightModel)) == 0
 
-def test_insight_default_created_at(db_session):
+def test_insight_default_created_at(db_session, make_user):
     """Test that created_at defaults to current time if not specified"""
-    user = User(
-        id=uuid.uuid4(),
-        username="defaultuser",
-        name="Default User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="defaultuser")
 
     # Create insight without specifying created_at
     insight = InsightModel(
@@ -129,16 +111,9 @@ def test_insight_default_created_at(db_session):
     assert insight.created_at is not None
     assert isinstance(insight.created_at, datetime)
 
-def test_insight_long_text(db_session):
+def test_insight_long_text(db_session, make_user):
     """Test that insight can handle long text content"""
-    user = User(
-        id=uuid.uuid4(),
-        username="longtextuser",
-        name="Long Text User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="longtextuser")
 
     long_insight_text = """
     This is a very long insight text that contains multiple paragraphs.
@@ -166,16 +141,9 @@ def test_insight_long_text(db_session):
     assert insight.insight == long_insight_text
     assert len(insight.insight) > 100  # Verify it's actually long
 
-def test_insight_multiple_insights_per_user(db_session):
+def test_insight_multiple_insights_per_user(db_session, make_user):
     """Test that a user can have multiple insights"""
-    user = User(
-        id=uuid.uuid4(),
-        username="multiuser",
-        name="Multi User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="multiuser")
 
     insights_data = [
         "You spend 30% more on food than the average user",
@@ -184,21 +152,20 @@ def test_insight_multiple_insights_per_user(db_session):
         "You're doing great with your entertainment budget"
     ]
 
-    for insight_text in insights_data:
-        insight = InsightModel(
-            id=uuid.uuid4(),
-            user_id=user.id,
-            insight=insight_text
-        )
-        db_session.add(insight)
-
+    # One bulk insert instead of four ORM instances added one at a time
+    rows = [
+        {"id": row_id, "user_id": user.id, "insight": insight_text}
+        for row_id, insight_text in zip(uuids(len(insights_data)), insights_data)
+    ]
+    db_session.bulk_insert_mappings(InsightModel, rows)
     db_session.commit()
 
     # Verify all insights exist
-    assert db_session.query(InsightModel).count() == 4
+    assert db_session.scalar(select(func.count()).select_from(InsightModel)) == 4
     
-    # Verify relationships
-    db_session.refresh(user)
+    # Verify relationships: selectin-load the insights together with the
+    # user fetch instead of refresh() plus a lazy-load SELECT
+    user = db_session.get(User, user.id, options=[selectinload(User.insights)], populate_existing=True)
     assert len(user.insights) == 4
 
     # Verify all insight texts are present
@@ -206,16 +173,9 @@ def test_insight_multiple_insights_per_user(db_session):
     for insight_text in insights_data:
         assert insight_text in user_insight_texts
 
-def test_insight_special_characters(db_session):
+def test_insight_special_characters(db_session, make_user):
     """Test that insight can handle special characters and emojis"""
-    user = User(
-        id=uuid.uuid4(),
-        username="specialuser",
-        name="Special User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="specialuser")
 
     special_insight = "💰 You're over budget! 📊 Consider cutting back on 🍕 food expenses. 💡 Tip: Try meal planning!"
 
@@ -231,16 +191,9 @@ def test_insight_special_characters(db_session):
     assert "💰" in insight.insight
     assert "🍕" in insight.insight
 
-def test_insight_empty_string(db_session):
+def test_insight_empty_string(db_session, make_user):
     """Test that insight cannot be empty string"""
-    user = User(
-        id=uuid.uuid4(),
-        username="emptyuser",
-        name="Empty User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="emptyuser")
 
     # Try to create insight with empty string
     insight = InsightModel(
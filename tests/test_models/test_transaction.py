@@ -1,22 +1,22 @@
 from app.models.transaction import TransactionModel
-from app.models.user import User
 import uuid
 from datetime import datetime
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import selectinload
+from tests.utils.mocks import uuids
+from app.models.user import User
 import pytest
 
-def test_create_transaction(db_session):
+# One wall-clock read per module: the tests only need a plausible
+# timestamp, not a fresh one per row
+_NOW = datetime.now()
+
+def test_create_transaction(db_session, make_user):
     """Test basic transaction creation with all required fields"""
     # Create user first
-    user = User(
-        id=uuid.uuid4(),
-        username="transactionuser",
-        name="Transaction User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="transactionuser")
 
-    transaction = TransactionModel(
+    row = dict(
         id=uuid.uuid4(),
         user_id=user.id,
         amount=100.00,
@@ -24,12 +24,11 @@ def test_create_transaction(db_session):
         category="Food",
         transaction_type="expense",
         source="debit",
-        timestamp=datetime.now()
+        timestamp=_NOW
     )
-
-    db_session.add(transaction)
-    db_session.commit()
-    db_session.refresh(transaction)
+    # INSERT ... RETURNING hands back the row with server defaults applied
+    # in one round-trip, replacing the post-commit refresh() SELECT
+    transaction = db_session.scalars(insert(TransactionModel).returning(TransactionModel), [row]).one()
 
     # Test all fields are properly set
     assert transaction.id is not None
@@ -42,10 +41,14 @@ def test_create_transaction(db_session):
     assert transaction.timestamp is not None
     assert isinstance(transaction.timestamp, datetime)
 
-    # Test relationship to user
-    assert transaction.user is not None
-    assert transaction.user.id == user.id
-    assert transaction.user.username == "transactionuser"
+    # Test relationship to user; no_autoflush skips the pointless
+    # pre-query flush check on the lazy load
+    with db_session.no_autoflush:
+        assert transaction.user is not None
+        assert transaction.user.id == user.id
+        assert transaction.user.username == "transactionuser"
+
+    db_session.commit()
 
 def test_transaction_foreign_key_constraint(db_session):
     """Test that transaction requires valid user_id"""
@@ -58,7 +61,7 @@ def test_transaction_foreign_key_constraint(db_session):
         category="Food",
         transaction_type="expense",
         source="debit",
-        timestamp=datetime.now()
+        timestamp=_NOW
     )
     
     db_session.add(transaction)
@@ -67,123 +70,42 @@ def test_transaction_foreign_key_constraint(db_session):
     # In a real PostgreSQL environment, this would raise a foreign key constraint error
     # For testing purposes, we'll verify the transaction is created but the relationship is None
     db_session.commit()
-    db_session.refresh(transaction)
     
     # Verify transaction exists but has no valid user relationship
     assert transaction.id is not None
     assert transaction.user_id is not None
     assert transaction.user is None  # Relationship should be None since user doesn't exist
 
-def test_transaction_required_fields(db_session):
-    """Test that required fields cannot be null"""
-    user = User(
-        id=uuid.uuid4(),
-        username="requireduser",
-        name="Required User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+# Complete, valid transaction kwargs for the required-field cases; built once
+# at import since the timestamp is a module constant anyway
+_TRANSACTION_BASE_KWARGS = dict(
+    amount=100.00,
+    description="Test Transaction",
+    category="Food",
+    transaction_type="expense",
+    source="debit",
+    timestamp=_NOW,
+)
 
-    # Test missing amount
-    transaction_no_amount = TransactionModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        description="Test Transaction",
-        category="Food",
-        transaction_type="expense",
-        source="debit",
-        timestamp=datetime.now()
-    )
-    db_session.add(transaction_no_amount)
-    with pytest.raises(Exception):
-        db_session.commit()
-    db_session.rollback()
 
-    # Test missing description
-    transaction_no_description = TransactionModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=100.00,
-        category="Food",
-        transaction_type="expense",
-        source="debit",
-        timestamp=datetime.now()
-    )
-    db_session.add(transaction_no_description)
-    with pytest.raises(Exception):
-        db_session.commit()
-    db_session.rollback()
+@pytest.mark.parametrize("missing", ["amount", "description", "category", "transaction_type", "source", "timestamp"])
+def test_transaction_required_fields(db_session, make_user, missing):
+    """Test that each required field in turn cannot be null"""
+    user = make_user(username="requireduser")
 
-    # Test missing category
-    transaction_no_category = TransactionModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=100.00,
-        description="Test Transaction",
-        transaction_type="expense",
-        source="debit",
-        timestamp=datetime.now()
-    )
-    db_session.add(transaction_no_category)
-    with pytest.raises(Exception):
-        db_session.commit()
-    db_session.rollback()
+    kwargs = dict(_TRANSACTION_BASE_KWARGS)
+    kwargs.pop(missing)
 
-    # Test missing transaction_type
-    transaction_no_type = TransactionModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=100.00,
-        description="Test Transaction",
-        category="Food",
-        source="debit",
-        timestamp=datetime.now()
-    )
-    db_session.add(transaction_no_type)
+    # SAVEPOINT per case: the failing INSERT rolls back to the savepoint
+    # at flush time instead of tearing down the surrounding transaction
     with pytest.raises(Exception):
-        db_session.commit()
-    db_session.rollback()
+        with db_session.begin_nested():
+            db_session.add(TransactionModel(id=uuid.uuid4(), user_id=user.id, **kwargs))
+            db_session.flush()
 
-    # Test missing source
-    transaction_no_source = TransactionModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=100.00,
-        description="Test Transaction",
-        category="Food",
-        transaction_type="expense",
-        timestamp=datetime.now()
-    )
-    db_session.add(transaction_no_source)
-    with pytest.raises(Exception):
-        db_session.commit()
-    db_session.rollback()
-
-    # Test missing timestamp
-    transaction_no_timestamp = TransactionModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=100.00,
-        description="Test Transaction",
-        category="Food",
-        transaction_type="expense",
-        source="debit"
-    )
-    db_session.add(transaction_no_timestamp)
-    with pytest.raises(Exception):
-        db_session.commit()
-
-def test_transaction_cascade_delete(db_session):
+def test_transaction_cascade_delete(db_session, make_user):
     """Test that deleting user cascades to transactions"""
-    user = User(
-        id=uuid.uuid4(),
-        username="cascadeuser",
-        name="Cascade User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="cascadeuser")
 
     transaction = TransactionModel(
         id=uuid.uuid4(),
@@ -193,91 +115,66 @@ def test_transaction_cascade_delete(db_session):
         category="Food",
         transaction_type="expense",
         source="debit",
-        timestamp=datetime.now()
+        timestamp=_NOW
     )
     db_session.add(transaction)
-    db_session.commit()
+    db_session.flush()
 
     # Verify transaction exists
-    assert db_session.query(TransactionModel).count() == 1
+    assert db_session.scalar(select(func.count()).select_from(TransactionModel)) == 1
 
     # Delete user
     db_session.delete(user)
     db_session.commit()
 
     # Verify transaction is deleted
-    assert db_session.query(TransactionModel).count() == 0
+    assert db_session.scalar(select(func.count()).select_from(TransactionModel)) == 0
 
-def test_transaction_different_types_and_sources(db_session):
+def test_transaction_different_types_and_sources(db_session, make_user):
     """Test creating transactions with different types and sources"""
-    user = User(
-        id=uuid.uuid4(),
-        username="typesuser",
-        name="Types User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
-
-    # Test income transaction
-    income_transaction = TransactionModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=1000.00,
-        description="Salary",
-        category="Income",
-        transaction_type="income",
-        source="debit",
-        timestamp=datetime.now()
-    )
-    db_session.add(income_transaction)
-    db_session.commit()
-
-    # Test expense transaction
-    expense_transaction = TransactionModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=-50.00,
-        description="Groceries",
-        category="Food",
-        transaction_type="expense",
-        source="credit",
-        timestamp=datetime.now()
-    )
-    db_session.add(expense_transaction)
-    db_session.commit()
-
-    # Test savings transaction
-    savings_transaction = TransactionModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=200.00,
-        description="Savings deposit",
-        category="Savings",
-        transaction_type="income",
-        source="savings",
-        timestamp=datetime.now()
-    )
-    db_session.add(savings_transaction)
+    user = make_user(username="typesuser")
+
+    # Income, expense and savings rows in one bulk insert and one commit
+    # instead of an add + commit round trip per transaction
+    rows = [
+        {
+            "amount": 1000.00,
+            "description": "Salary",
+            "category": "Income",
+            "transaction_type": "income",
+            "source": "debit",
+        },
+        {
+            "amount": -50.00,
+            "description": "Groceries",
+            "category": "Food",
+            "transaction_type": "expense",
+            "source": "credit",
+        },
+        {
+            "amount": 200.00,
+            "description": "Savings deposit",
+            "category": "Savings",
+            "transaction_type": "income",
+            "source": "savings",
+        },
+    ]
+    for row, row_id in zip(rows, uuids(len(rows))):
+        row.update(id=row_id, user_id=user.id, timestamp=_NOW)
+    db_session.bulk_insert_mappings(TransactionModel, rows)
     db_session.commit()
 
     # Verify all transactions exist
-    assert db_session.query(TransactionModel).count() == 3
+    assert db_session.scalar(select(func.count()).select_from(TransactionModel)) == 3
     
-    # Verify relationships
-    db_session.refresh(user)
+    # Verify relationships: selectin-load the transactions together with
+    # the user fetch instead of refresh() plus a lazy-load SELECT
+    user = db_session.get(User, user.id, options=[selectinload(User.transactions)], populate_existing=True)
     assert len(user.transactions) == 3
 
-def test_transaction_negative_amounts(db_session):
+def test_transaction_negative_amounts(db_session, make_user):
     """Test that negative amounts are allowed for expenses"""
-    user = User(
-        id=uuid.uuid4(),
-        username="negativeuser",
-        name="Negative User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="negativeuser")
 
     # Test negative amount for expense
     negative_transaction = TransactionModel(
@@ -288,7 +185,7 @@ def test_transaction_negative_amounts(db_session):
         category="Dining",
         transaction_type="expense",
         source="debit",
-        timestamp=datetime.now()
+        timestamp=_NOW
     )
     db_session.add(negative_transaction)
     db_session.commit()
@@ -1,5 +1,6 @@
 # tests/test_models/test_user.py
 import pytest
+from sqlalchemy import func, select
 from app.models.user import User
 import uuid
 from datetime import datetime
@@ -13,8 +14,7 @@ def test_create_user(db_session):
         hashed_password="password_fake_hash"
     )
     db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
+    db_session.flush()
 
     # Test all fields are properly set
     assert user.id is not None
@@ -42,7 +42,7 @@ def test_user_unique_username_constraint(db_session):
         hashed_password="hash1"
     )
     db_session.add(user1)
-    db_session.commit()
+    db_session.flush()
 
     # Try to create second user with same username
     user2 = User(
@@ -55,58 +55,16 @@ def test_user_unique_username_constraint(db_session):
     
     # Should raise integrity error
     with pytest.raises(Exception):  # SQLAlchemy will raise IntegrityError
-        db_session.commit()
+        db_session.flush()
 
-def test_user_relationships_with_related_objects(db_session):
+def test_user_relationships_with_related_objects(db_session, make_user, make_related_rows):
     """Test user relationships when related objects exist"""
-    from app.models.transaction import TransactionModel
-    from app.models.budget import BudgetModel
-    from app.models.insight import InsightModel
-    
-    # Create user
-    user = User(
-        id=uuid.uuid4(),
-        username="reluser",
-        name="Relationship User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
+    user = make_user(username="reluser")
+    transaction, budget, insight = make_related_rows(user)
 
-    # Create related objects
-    transaction = TransactionModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=100.0,
-        description="Test Transaction",
-        category="Food",
-        transaction_type="expense",
-        source="debit",
-        timestamp=datetime.now()
-    )
-    
-    budget = BudgetModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=500.0,
-        category="Food",
-        description="Monthly food budget",
-        start_date=datetime.now(),
-        end_date=datetime.now(),
-        is_active=True
-    )
-    
-    insight = InsightModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        insight="You spend too much on food"
-    )
-    
-    db_session.add_all([transaction, budget, insight])
-    db_session.commit()
-    db_session.refresh(user)
+    # Test relationships contain the objects; the collections were never
+    # loaded, so the first access lazy-loads them without a refresh()
 
-    # Test relationships contain the objects
     assert len(user.transactions) == 1
     assert user.transactions[0].id == transaction.id
     assert len(user.budgets) == 1
@@ -114,66 +72,29 @@ def test_user_relationships_with_related_objects(db_session):
     assert len(user.insights) == 1
     assert user.insights[0].id == insight.id
 
-def test_user_cascade_delete(db_session):
+def test_user_cascade_delete(db_session, make_user, make_related_rows):
     """Test that deleting user cascades to related objects"""
     from app.models.transaction import TransactionModel
     from app.models.budget import BudgetModel
     from app.models.insight import InsightModel
-    
-    # Create user with related objects
-    user = User(
-        id=uuid.uuid4(),
-        username="cascadeuser",
-        name="Cascade User",
-        hashed_password="hash"
-    )
-    db_session.add(user)
-    db_session.commit()
 
-    transaction = TransactionModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=100.0,
-        description="Test Transaction",
-        category="Food",
-        transaction_type="expense",
-        source="debit",
-        timestamp=datetime.now()
-    )
-    
-    budget = BudgetModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        amount=500.0,
-        category="Food",
-        description="Monthly food budget",
-        start_date=datetime.now(),
-        end_date=datetime.now(),
-        is_active=True
-    )
-    
-    insight = InsightModel(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        insight="Test insight"
-    )
-    
-    db_session.add_all([transaction, budget, insight])
-    db_session.commit()
+    # Create user with related objects
+    user = make_user(username="cascadeuser")
+    make_related_rows(user)
 
     # Verify objects exist
-    assert db_session.query(TransactionModel).count() == 1
-    assert db_session.query(BudgetModel).count() == 1
-    assert db_session.query(InsightModel).count() == 1
+    assert db_session.scalar(select(func.count()).select_from(TransactionModel)) == 1
+    assert db_session.scalar(select(func.count()).select_from(BudgetModel)) == 1
+    assert db_session.scalar(select(func.count()).select_from(InsightModel)) == 1
 
     # Delete user
     db_session.delete(user)
-    db_session.commit()
+    db_session.flush()
 
     # Verify related objects are deleted
-    assert db_session.query(TransactionModel).count() == 0
-    assert db_session.query(BudgetModel).count() == 0
-    assert db_session.query(InsightModel).count() == 0
+    assert db_session.scalar(select(func.count()).select_from(TransactionModel)) == 0
+    assert db_session.scalar(select(func.count()).select_from(BudgetModel)) == 0
+    assert db_session.scalar(select(func.count()).select_from(InsightModel)) == 0
 
 def test_user_required_fields(db_session):
     """Test that required fields cannot be null"""
@@ -185,7 +106,7 @@ def test_user_required_fields(db_session):
     )
     db_session.add(user_no_username)
     with pytest.raises(Exception):
-        db_session.commit()
+        db_session.flush()
     db_session.rollback()
 
     # Test missing name
@@ -196,7 +117,7 @@ def test_user_required_fields(db_session):
     )
     db_session.add(user_no_name)
     with pytest.raises(Exception):
-        db_session.commit()
+        db_session.flush()
     db_session.rollback()
 
     # Test missing password
@@ -207,4 +128,4 @@ def test_user_required_fields(db_session):
     )
     db_session.add(user_no_password)
     with pytest.raises(Exception):
-        db_session.commit()
+        db_session.flush()
@@ -1,5 +1,5 @@
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 from app.models.user import User
 from tests.utils.mocks import get_mock_db
 from app.main import app
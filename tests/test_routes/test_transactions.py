@@ -1,5 +1,5 @@
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock, patch, ANY
+from unittest.mock import patch, ANY
 from app.models.user import User
 from app.models.transaction import TransactionModel
 from tests.utils.mocks import get_mock_db
@@ -15,7 +15,7 @@ from unittest.mock import Mock
 client = TestClient(app)
 
 @patch("app.routes.upload.extract_text_from_pdf")
-@patch("app.routes.upload.call_llm_to_extract_transactions")
+@patch("app.routes.upload.acall_llm_to_extract_transactions")
 def test_process_pdf_creates_transactions(mock_llm, mock_pdf):
     """
     Test the whole flow of processing a PDF and creating transactions
@@ -184,16 +184,22 @@ def test_insert_transactions():
         }
     ]
     
+    # RETURNING yields one id per row that survived duplicate rejection
+    mock_db.execute.return_value.scalars.return_value.all.return_value = [
+        uuid.uuid4(), uuid.uuid4()
+    ]
+
     # Test insertion
     result = insert_transactions(valid_transactions, mock_db, mock_user)
-    
+
     # Should return count of inserted transactions
     assert result == 2
-    
-    # Database should have been called to add transactions
-    assert mock_db.add.call_count == 2
+
+    # Database should have received one bulk INSERT with both rows
+    mock_db.execute.assert_called_once()
+    assert len(mock_db.execute.call_args[0][1]) == 2
     mock_db.commit.assert_called_once()
-    
+
 def test_insert_transactions_with_invalid_data():
     """
     Test that invalid transactions are skipped gracefully
@@ -236,14 +242,20 @@ def test_insert_transactions_with_invalid_data():
         }
     ]
     
+    # RETURNING yields one id per row that survived duplicate rejection
+    mock_db.execute.return_value.scalars.return_value.all.return_value = [
+        uuid.uuid4(), uuid.uuid4()
+    ]
+
     # Test insertion - should only insert valid transactions
     result = insert_transactions(mixed_transactions, mock_db, mock_user)
     
     # Should return count of successfully inserted transactions (2 valid ones)
     assert result == 2
-    
-    # Database should have been called to add only valid transactions
-    assert mock_db.add.call_count == 2
+
+    # Database should have received one bulk INSERT with only the valid rows
+    mock_db.execute.assert_called_once()
+    assert len(mock_db.execute.call_args[0][1]) == 2
     mock_db.commit.assert_called_once()
 
 # def test_full_functionality_process_uploaded_pdf():
@@ -1,9 +1,59 @@
+import functools
+import os
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from app.models.user import User
+from app.core.security import hash_password
 import uuid
 from datetime import datetime
 
+# Frozen identity defaults for fake users: no test asserts on id/created_at
+# values themselves, so there is no reason to hit the RNG and clock per user
+_FIXED_UUID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+_FIXED_TS = datetime(2024, 1, 1)
+
+
+def fake_user(**kw) -> SimpleNamespace:
+    """
+    Build a user stand-in without SQLAlchemy's instrumented attribute
+    machinery.
+
+    Tests that only hand the object to an overridden dependency or serialize
+    it in a response never need a mapped User instance; a SimpleNamespace
+    has the same attribute surface at a fraction of the construction cost.
+    """
+    kw.setdefault("id", _FIXED_UUID)
+    kw.setdefault("created_at", _FIXED_TS)
+    return SimpleNamespace(**kw)
+
+
+def uuids(n: int) -> list:
+    """
+    Generate n random UUIDs from one os.urandom read.
+
+    Loop tests that stamp an id per row pay a syscall and UUID object
+    construction for every uuid.uuid4() call; slicing a single 16*n byte
+    buffer amortizes that to one syscall for the whole batch.
+    """
+    buf = os.urandom(16 * n)
+    return [uuid.UUID(bytes=buf[i * 16:(i + 1) * 16]) for i in range(n)]
+
+
+@functools.lru_cache(maxsize=None)
+def cached_hash(password: str) -> str:
+    """
+    Memoized hash_password for tests.
+
+    bcrypt is intentionally slow, and the suite reuses a handful of literal
+    passwords; caching makes the KDF cost per unique password instead of
+    per test.
+    """
+    return hash_password(password)
+
+@functools.lru_cache(maxsize=2)
 def get_mock_db(user_exists: bool = False):
+    # Cached per flag: tests only read query results off this mock and never
+    # assert on its call history, so one MagicMock tree per variant is enough
     mock_db = MagicMock()
     
     # Create a mock query object